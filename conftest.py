@@ -0,0 +1,162 @@
+from collections import OrderedDict
+import copy
+import os
+
+import pyang.context
+import pyang.repository
+import pytest
+
+from alpakka.wrapper import wrap_module
+from wools.java import javautils
+from wools.java.java_wool import TYPE_PATTERNS
+from wools.java.akka import WOOL as AKKA_WOOL
+from wools.java.jersey import WOOL as JERSEY_WOOL
+
+COPYRIGHT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'wools', 'java', 'akka', 'config', 'copyright.txt')
+
+# models covering the node types the bean templates distinguish
+MODELS = {
+    'bench-devices': """
+module bench-devices {
+  namespace "urn:bench:devices";
+  prefix bd;
+  typedef percent { type uint8; description "A percentage"; }
+  typedef ratio { type decimal64 { fraction-digits 2; } }
+  typedef color { type enumeration { enum red; enum green-ish; } }
+  typedef mode { type enumeration { enum active; enum standby; } }
+  typedef address { type union { type string; type int32; } }
+  typedef flags { type bits { bit up; bit admin-down; } }
+  grouping endpoint {
+    description "An endpoint,
+      described on two lines";
+    leaf name { type string; description "The name"; }
+    leaf port { type uint16; }
+  }
+  container config {
+    leaf enabled { type boolean; }
+    leaf level { type percent; }
+    leaf load { type ratio; }
+    leaf paint { type color; }
+    leaf state { type mode; }
+    leaf where { type address; }
+    leaf status { type flags; }
+    leaf data { type binary; }
+    list server {
+      key "id";
+      leaf id { type string; }
+      leaf weight { type int32; }
+      leaf-list tags { type string; }
+      leaf-list ports { type uint16; }
+      container details {
+        leaf note { type string; }
+        list slot {
+          key "slot-no";
+          leaf slot-no { type string; }
+          leaf used { type boolean; }
+        }
+      }
+    }
+    container peer { uses endpoint; }
+    container empty { presence "empty"; }
+  }
+  list device {
+    key "name";
+    leaf name { type string; }
+    leaf unit { type percent; }
+    leaf kind { type color; }
+  }
+}
+""",
+    'bench-inventory': """
+module bench-inventory {
+  namespace "urn:bench:inventory";
+  prefix bi;
+  typedef serial { type string { pattern "[A-Z0-9]+"; } }
+  typedef locator { type union { type serial; type uint32; } }
+  container inventory {
+    description "The inventory";
+    list item {
+      key "serial";
+      leaf serial { type serial; }
+      leaf count { type uint32; }
+      leaf-list labels { type string; }
+      container location {
+        leaf slot { type locator; }
+        leaf rack { type string; }
+        leaf shelf { type int8; }
+      }
+    }
+  }
+}
+""",
+}
+
+
+def wrapped_modules(wool, directory, models=MODELS, extra_config=''):
+    """
+    Configures the wool and wraps the given yang models with it.
+    """
+    config = directory.join('wool_config.ini')
+    config.write('[Wool]\nprefix = com.example\ncopyright = %s\n%s' %
+                 (COPYRIGHT, extra_config))
+    wool.parse_config(str(config))
+    repository = pyang.repository.FileRepository(os.path.dirname(__file__))
+    context = pyang.context.Context(repository)
+    statements = [context.add_module(name, text)
+                  for name, text in models.items()]
+    context.validate()
+    return [wrap_module(statement, wool=wool) for statement in statements]
+
+
+def generated_files(wool, directory, models=MODELS, extra_config=''):
+    """
+    Generates the given yang models like the alpakka plugin does.
+
+    :return: the generated java files by their path in the output directory
+    """
+    output = directory.join('output')
+    wool.output_path = str(output)
+    modules = OrderedDict(
+        (module.yang_module(), module)
+        for module in wrapped_modules(wool, directory, models, extra_config))
+    for module in modules.values():
+        wool.wrapping_postprocessing(module, modules)
+    for module in modules.values():
+        wool.generate_output(module)
+    return {path.relto(output): path.read()
+            for path in output.visit(fil='*.java')}
+
+
+@pytest.fixture(autouse=True)
+def restore_wools():
+    """
+    Restores the configuration of the wools, which is changed by the tests.
+    """
+    saved = [(wool, {key: copy.copy(value) if isinstance(
+                         value, (dict, list, set)) else value
+                     for key, value in vars(wool).items()})
+             for wool in (AKKA_WOOL, JERSEY_WOOL)]
+    yield
+    for wool, attributes in saved:
+        vars(wool).clear()
+        vars(wool).update(attributes)
+        wool.data_type_mappings = javautils.TypeResolver(TYPE_PATTERNS)
+
+
+@pytest.fixture
+def wrap(tmpdir):
+    """
+    Wraps the given yang models, see wrapped_modules.
+    """
+    return lambda wool, models=MODELS, extra_config='': wrapped_modules(
+        wool, tmpdir, models, extra_config)
+
+
+@pytest.fixture
+def generate(tmpdir):
+    """
+    Generates the given yang models, see generated_files.
+    """
+    return lambda wool, models=MODELS, extra_config='': generated_files(
+        wool, tmpdir, models, extra_config)
@@ -0,0 +1,44 @@
+import pytest
+
+from wools.java.akka import WOOL as AKKA_WOOL
+
+PACKAGE = 'src/com/example/bench/devices/'
+
+
+@pytest.mark.parametrize('async_backend', [False, True])
+def test_async_backend_returns_completion_stages(async_backend, generate):
+    files = generate(AKKA_WOOL,
+                     extra_config='beans-only = False\n'
+                                  'async-backend = %s\n' % async_backend)
+    interface = files[PACKAGE + 'BdInterface.java']
+    backend = files[PACKAGE + 'BdBackend.java']
+    routes = files[PACKAGE + 'BdRoutes.java']
+    if async_backend:
+        assert 'CompletionStage<Color> getDeviceKind(String name);' \
+            in interface
+        assert 'CompletionStage<List<DeviceListType>> getDevice();' \
+            in interface
+        assert 'public CompletionStage<Boolean> getConfigEnabled() {' \
+            in backend
+        assert 'return CompletableFuture.completedFuture(false);' in backend
+        assert 'private <T> Route jsonMarshallOK(' \
+            'Supplier<CompletionStage<T>> value) {' in routes
+        assert 'completeOKWithFuture(value.get(), Jackson.marshaller())' \
+            in routes
+    else:
+        assert 'CompletionStage' not in interface
+        assert '  Color getDeviceKind(String name);' in interface
+        assert 'public boolean getConfigEnabled() {' in backend
+        assert 'CompletableFuture' not in backend
+        assert 'completeOK(value.get(), Jackson.marshaller())' in routes
+
+
+def test_async_backend_projects_bulk_fetches(generate):
+    files = generate(AKKA_WOOL,
+                     extra_config='beans-only = False\nbulk-fetch = True\n'
+                                  'async-backend = True\n')
+    assert 'CompletionStage<Config> fetchConfig(List<String> path, ' \
+        'int depth);' in files[PACKAGE + 'BdInterface.java']
+    assert '.thenApply(bulkRoot -> Optional.ofNullable(bulkRoot)' \
+        '.map(bulkNode -> bulkNode.getEnabled()).orElse(null))' \
+        in files[PACKAGE + 'BdRoutes.java']
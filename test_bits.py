@@ -0,0 +1,26 @@
+from wools.java.akka import WOOL as AKKA_WOOL
+
+
+def test_bits_are_stored_in_a_long(generate):
+    flags = generate(AKKA_WOOL)['src/com/example/bench/devices/Flags.java']
+    assert 'UP("up", 0),' in flags
+    assert 'ADMIN_DOWN("admin-down", 1);' in flags
+    assert 'private final long bits;' in flags
+    assert 'public static final Flags EMPTY = new Flags(0L);' in flags
+    assert 'long[]' not in flags
+
+
+def test_bits_beyond_64_are_stored_in_a_long_array(generate):
+    models = {'bench-wide': """
+module bench-wide {
+  namespace "urn:bench:wide";
+  prefix bw;
+  typedef wide { type bits { bit low; bit high { position 70; } } }
+  leaf w { type wide; }
+}
+"""}
+    wide = generate(AKKA_WOOL, models)['src/com/example/bench/wide/Wide.java']
+    assert 'HIGH("high", 70);' in wide
+    assert 'private final long[] bits;' in wide
+    assert 'public static final Wide EMPTY = new Wide(new long[2]);' in wide
+    assert '(bits[bit.position >>> 6] & 1L << bit.position) != 0' in wide
@@ -0,0 +1,32 @@
+from wools.java.akka import WOOL as AKKA_WOOL
+
+PACKAGE = 'src/com/example/bench/devices/'
+
+
+def test_builder_defaults_are_shared(generate):
+    config = generate(AKKA_WOOL)[PACKAGE + 'Config.java']
+    assert 'public static final Config DEFAULT = new Builder().build();' \
+        in config
+    # beans and base types share their DEFAULT instance
+    assert 'this.peer = this.peer != null ? this.peer : Endpoint.DEFAULT;' \
+        in config
+    assert 'this.level = this.level != null ? this.level : Percent.DEFAULT;' \
+        in config
+    # enumerations use their first constant, bits the empty value
+    assert 'this.paint = this.paint != null ? this.paint : Color.RED;' \
+        in config
+    assert 'this.status = this.status != null ? this.status : Flags.EMPTY;' \
+        in config
+    assert 'values()[0]' not in config
+    # unions have no default member and stay unset
+    assert 'this.where = this.where' not in config
+
+
+def test_builder_collects_lists(generate):
+    config = generate(AKKA_WOOL)[PACKAGE + 'Config.java']
+    assert 'private ImmutableList.Builder<ServerListType> server;' in config
+    assert 'public Builder addServer(ServerListType element){' in config
+    assert 'this.server = server != null ? ' \
+        'ImmutableList.<ServerListType>builder().addAll(server) : null;' \
+        in config
+    assert 'buildList(server)' in config
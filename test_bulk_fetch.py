@@ -0,0 +1,19 @@
+import pytest
+
+from wools.java.akka import WOOL as AKKA_WOOL
+
+
+@pytest.mark.parametrize('key_classes', [False, True])
+def test_bulk_fetch_routes_match_typed_keys(key_classes, generate):
+    files = generate(
+        AKKA_WOOL,
+        extra_config='beans-only = False\nbulk-fetch = True\n'
+                     'interface-levels = 2\nkey-classes = %s\n' % key_classes)
+    routes = files['src/com/example/bench/inventory/BiRoutes.java']
+    if key_classes:
+        assert 'findEntry(bulkEntries, () -> ItemKey.fromPath(serial), ' \
+            'ItemKey::of)' in routes
+    else:
+        assert 'findEntry(bulkEntries, () -> new Serial(serial), ' \
+            'bulkEntry -> bulkEntry.getSerial())' in routes
+    assert 'String.valueOf' not in routes
@@ -0,0 +1,39 @@
+import re
+
+import pytest
+
+from wools.java.akka import WOOL as AKKA_WOOL
+from wools.java.jersey import WOOL as JERSEY_WOOL
+
+INTERFACE_METHOD = re.compile(r'^  [\w<>\[\], ?]+ (\w+)\(([^)]*)\);$', re.M)
+CACHED_METHOD = re.compile(
+    r'^  @Override\n  public [\w<>\[\], ?]+ (\w+)\(([^)]*)\) \{$', re.M)
+
+
+def interface_methods(files, package):
+    """
+    Collects the methods of the module interfaces of the given package,
+    including the subtree interfaces they extend.
+    """
+    return {method for path, content in files.items()
+            if path.startswith(package) and path.endswith('Interface.java')
+            for method in INTERFACE_METHOD.findall(content)}
+
+
+@pytest.mark.parametrize('wool, extra_config', [
+    (AKKA_WOOL, ''),
+    (AKKA_WOOL, 'interface-levels = 2\nquery-parameters = True\n'),
+    (AKKA_WOOL, 'bulk-fetch = True\nentity-tags = True\n'),
+    (AKKA_WOOL, 'split-subtrees = True\nasync-backend = True\n'),
+    (JERSEY_WOOL, 'interface-levels = 2\n'),
+])
+def test_caching_backend_overrides_interface(wool, extra_config, generate):
+    files = generate(wool, extra_config='beans-only = False\n'
+                                        'caching-backend = True\n' +
+                                        extra_config)
+    for package, module in [('src/com/example/bench/devices/', 'Bd'),
+                            ('src/com/example/bench/inventory/', 'Bi')]:
+        cached = files['%s%sCachingBackend.java' % (package, module)]
+        methods = interface_methods(files, package)
+        assert methods
+        assert set(CACHED_METHOD.findall(cached)) == methods
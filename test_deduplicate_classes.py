@@ -0,0 +1,87 @@
+import pytest
+
+from wools.java.akka import WOOL as AKKA_WOOL
+
+# equally shaped lists in one container
+TWIN_MODELS = {
+    'bench-twins': """
+module bench-twins {
+  namespace "urn:bench:twins";
+  prefix bt;
+  container twins {
+    list left {
+      key "id";
+      leaf id { type string; }
+      leaf size { type uint32; }
+    }
+    list right {
+      key "id";
+      leaf id { type string; }
+      leaf size { type uint32; }
+    }
+  }
+}
+""",
+}
+
+# equally shaped lists, whose level leafs refer to classes of the same name
+# in different packages
+QUALIFIED_MODELS = {
+    'bench-levels': """
+module bench-levels {
+  namespace "urn:bench:levels";
+  prefix bl;
+  typedef level { type string; }
+}
+""",
+    'bench-meters': """
+module bench-meters {
+  namespace "urn:bench:meters";
+  prefix bm;
+  import bench-levels { prefix bl; }
+  typedef level { type uint8; }
+  container meters {
+    list local {
+      key "id";
+      leaf id { type string; }
+      leaf level { type level; }
+    }
+    list remote {
+      key "id";
+      leaf id { type string; }
+      leaf level { type bl:level; }
+    }
+  }
+}
+""",
+}
+
+
+def test_deduplicate_classes_compares_qualified_types(generate):
+    files = generate(AKKA_WOOL, QUALIFIED_MODELS,
+                     'deduplicate-classes = True\n')
+    package = 'src/com/example/bench/meters/'
+    assert package + 'LocalListType.java' in files
+    assert package + 'RemoteListType.java' in files
+    assert 'import com.example.bench.levels.Level;' in \
+        files[package + 'RemoteListType.java']
+
+
+@pytest.mark.parametrize('deduplicate', [False, True])
+def test_deduplicate_classes_rewrites_references(deduplicate, generate):
+    files = generate(AKKA_WOOL, TWIN_MODELS,
+                     'beans-only = False\n'
+                     'deduplicate-classes = %s\n' % deduplicate)
+    package = 'src/com/example/bench/twins/'
+    right = 'LeftListType' if deduplicate else 'RightListType'
+    assert package + 'LeftListType.java' in files
+    assert (package + 'RightListType.java' in files) is not deduplicate
+    twins = files[package + 'Twins.java']
+    assert 'private final List<%s> right;' % right in twins
+    assert 'public Builder addRight(%s element){' % right in twins
+    interface = files[package + 'BtInterface.java']
+    assert 'List<%s> getTwinsRight();' % right in interface
+    assert '%s getTwinsRight(String id);' % right in interface
+    if deduplicate:
+        assert not any('RightListType' in content
+                       for content in files.values())
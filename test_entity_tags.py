@@ -0,0 +1,30 @@
+import pytest
+
+from wools.java.akka import WOOL as AKKA_WOOL
+
+PACKAGE = 'src/com/example/bench/devices/'
+
+
+@pytest.mark.parametrize('async_backend', [False, True])
+def test_entity_tags_add_version(async_backend, generate):
+    files = generate(AKKA_WOOL,
+                     extra_config='beans-only = False\nentity-tags = True\n'
+                                  'async-backend = %s\n' % async_backend)
+    version = 'CompletionStage<String>' if async_backend else 'String'
+    interface = files[PACKAGE + 'BdInterface.java']
+    assert '  %s getVersion(String path);' % version in interface
+    assert 'public %s getVersion(String path) {' % version in \
+        files[PACKAGE + 'BdBackend.java']
+    routes = files[PACKAGE + 'BdRoutes.java']
+    assert 'import akka.http.javadsl.model.headers.EntityTag;' in routes
+    assert 'private Route versionTag(Supplier<Route> inner) {' in routes
+    assert 'conditional(EntityTag.create(version, false), inner)' in routes
+    assert 'versionTag(() ->' in routes
+
+
+def test_entity_tags_off_have_no_version(generate):
+    files = generate(AKKA_WOOL, extra_config='beans-only = False\n')
+    assert 'getVersion' not in files[PACKAGE + 'BdInterface.java']
+    routes = files[PACKAGE + 'BdRoutes.java']
+    assert 'versionTag' not in routes
+    assert 'EntityTag' not in routes
@@ -0,0 +1,35 @@
+import pytest
+
+from wools.java import javaemitter
+from wools.java.akka import WOOL as AKKA_WOOL
+from wools.java.jersey import WOOL as JERSEY_WOOL
+
+
+def rendered_nodes(module):
+    yield 'grouping.jinja', module.classes
+    yield 'class_type.jinja', module.base_extensions()
+    yield 'enum_type.jinja', module.enums()
+
+
+@pytest.mark.parametrize('wool', [AKKA_WOOL, JERSEY_WOOL],
+                         ids=lambda wool: wool.name)
+def test_emitters_match_templates(wool, wrap):
+    compared = 0
+    for module in wrap(wool):
+        for template_name, nodes in rendered_nodes(module):
+            emitter = wool.emitters.get(template_name)
+            if emitter is None:
+                continue
+            template = module.env.get_template(template_name)
+            for name, node in nodes.items():
+                expected = template.render(ctx=node, name=name)
+                assert emitter(node, name) == expected, name
+                compared += 1
+    assert compared
+
+
+def test_emitters_leave_unsupported_options_to_the_templates(wrap):
+    module = wrap(AKKA_WOOL)[0]
+    AKKA_WOOL.streaming_json = True
+    name, node = next(iter(module.classes.items()))
+    assert javaemitter.grouping(node, name) is None
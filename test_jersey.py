@@ -0,0 +1,31 @@
+import pytest
+
+from wools.java.jersey import WOOL as JERSEY_WOOL
+
+
+def test_jersey_resources_pass_query_parameters(generate):
+    files = generate(JERSEY_WOOL,
+                     extra_config='beans-only = False\n'
+                                  'interface-levels = 2\n'
+                                  'query-parameters = True\n')
+    package = 'src/com/example/bench/devices/'
+    interface = files[package + 'BdInterface.java']
+    routes = files[package + 'BdRoutes.java']
+    assert 'CompletionStage<List<ServerListType>> getConfigServer(' \
+        'int offset, int limit);' in interface
+    assert 'getConfigServer(@QueryParam("offset") @DefaultValue("0") ' \
+        'int offset, @QueryParam("limit") @DefaultValue("-1") int limit)' \
+        in routes
+    assert 'backend.getConfigServer(offset, limit)' in routes
+    assert 'CompletionStage<Config> getConfig(Set<String> fields);' \
+        in interface
+    assert 'backend.getConfig(fieldSet(fields))' in routes
+    # the backend templates are shared with the akka wool
+    assert 'akka' not in files[package + 'BdBackend.java']
+
+
+@pytest.mark.parametrize('option', ['bulk-fetch', 'entity-tags'])
+def test_jersey_rejects_unsupported_options(option, wrap):
+    with pytest.raises(ValueError):
+        wrap(JERSEY_WOOL, extra_config='beans-only = False\n'
+                                       '%s = True\n' % option)
@@ -0,0 +1,38 @@
+import pytest
+
+from wools.java.akka import WOOL as AKKA_WOOL
+from wools.java.jersey import WOOL as JERSEY_WOOL
+
+PACKAGE = 'src/com/example/bench/inventory/'
+
+
+def test_key_classes_document_and_reject_unparsable_keys(generate):
+    files = generate(AKKA_WOOL,
+                     extra_config='beans-only = False\nkey-classes = True\n'
+                                  'interface-levels = 3\n')
+    key = files[PACKAGE + 'ItemKey.java']
+    assert '@param serial the value of the serial key leaf' in key
+    assert '@throws IllegalArgumentException' in key
+    routes = files[PACKAGE + 'BiRoutes.java']
+    assert 'extractKey(serial -> validKey(() -> route(' in routes
+    assert '.match(IllegalArgumentException.class, e -> reject())' in routes
+    assert PACKAGE + 'BiIndexedBackend.java' in files
+
+
+def test_jersey_key_classes_reject_unparsable_keys(generate):
+    files = generate(JERSEY_WOOL,
+                     extra_config='beans-only = False\nkey-classes = True\n'
+                                  'interface-levels = 3\n')
+    routes = files[PACKAGE + 'BiRoutes.java']
+    assert 'return validKey(() -> backend.getInventoryItem(serial));' \
+        in routes
+    assert 'return backend.getInventoryItem();' in routes
+
+
+@pytest.mark.parametrize('interface_levels', [1, 3])
+def test_bulk_fetch_has_no_indexed_backend(interface_levels, generate):
+    files = generate(AKKA_WOOL,
+                     extra_config='beans-only = False\nkey-classes = True\n'
+                                  'bulk-fetch = True\n'
+                                  'interface-levels = %d\n' % interface_levels)
+    assert not [path for path in files if path.endswith('IndexedBackend.java')]
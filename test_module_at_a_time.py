@@ -0,0 +1,62 @@
+from collections import OrderedDict
+
+import pytest
+
+from conftest import MODELS
+from wools.java.akka import WOOL as AKKA_WOOL
+from wools.java.java_wool import ModuleIndex
+
+# a grouping that is only used by the modules importing it
+SHARED_MODELS = OrderedDict([('bench-common', """
+module bench-common {
+  namespace "urn:bench:common";
+  prefix bc;
+  grouping counters {
+    leaf received { type uint32; }
+    leaf sent { type uint32; }
+  }
+  container common { leaf name { type string; } }
+}
+"""), ('bench-left', """
+module bench-left {
+  namespace "urn:bench:left";
+  prefix bl;
+  import bench-common { prefix bc; }
+  container left {
+    uses bc:counters;
+    leaf name { type string; }
+  }
+}
+"""), ('bench-right', """
+module bench-right {
+  namespace "urn:bench:right";
+  prefix br;
+  import bench-common { prefix bc; }
+  container right { uses bc:counters; }
+}
+""")])
+
+
+@pytest.mark.parametrize('models', [MODELS, SHARED_MODELS],
+                         ids=['bench', 'shared'])
+def test_module_at_a_time_matches_the_wrapped_modules(
+        models, tmpdir, wrap, generate):
+    config = 'beans-only = False\nstreaming-json = True\nkey-classes = True\n'
+    files = generate(AKKA_WOOL, models, config)
+    tmpdir.join('output').remove()
+    config += 'module-at-a-time = True\n'
+    assert generate(AKKA_WOOL, models, config) == files
+    if models is SHARED_MODELS:
+        # registered by the origin module, generated by the first user
+        assert 'com.example.bench.common.Counters.Deserializer()' in \
+            files['src/com/example/bench/common/BcJsonModule.java']
+    indexes = wrap(AKKA_WOOL, models, config)
+    assert all(isinstance(index, ModuleIndex) for index in indexes)
+    assert all(isinstance(entry, tuple)
+               for index in indexes for entry in index.classes.values())
+
+
+def test_module_at_a_time_rejects_deduplicate_classes(wrap):
+    with pytest.raises(ValueError):
+        wrap(AKKA_WOOL, extra_config='module-at-a-time = True\n'
+                                     'deduplicate-classes = True\n')
@@ -0,0 +1,29 @@
+import pytest
+
+from wools.java.akka import WOOL as AKKA_WOOL
+
+
+@pytest.mark.parametrize('query_params', [False, True])
+def test_query_parameters_in_interface_and_routes(query_params, generate):
+    files = generate(AKKA_WOOL,
+                     extra_config='beans-only = False\n'
+                                  'query-parameters = %s\n' % query_params)
+    interface = files['src/com/example/bench/devices/BdInterface.java']
+    routes = files['src/com/example/bench/devices/BdRoutes.java']
+    if query_params:
+        assert 'List<DeviceListType> getDevice(int offset, int limit);' \
+            in interface
+        assert 'DeviceListType getDevice(String name, Set<String> fields);' \
+            in interface
+        assert 'Config getConfig(Set<String> fields);' in interface
+        # leafs have no query parameters
+        assert 'String getDeviceName(String name);' in interface
+        assert 'pageParameters((offset, limit) -> jsonMarshallOK(() -> ' \
+            'backend.getDevice(offset, limit)))' in routes
+        assert 'fieldsParameter(fields -> jsonMarshallOK(() -> ' \
+            'backend.getDevice(name, fields)))' in routes
+    else:
+        assert 'List<DeviceListType> getDevice();' in interface
+        assert 'DeviceListType getDevice(String name);' in interface
+        assert 'pageParameters' not in routes
+        assert 'fieldsParameter' not in routes
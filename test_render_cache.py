@@ -0,0 +1,22 @@
+from wools.java.akka import WOOL as AKKA_WOOL
+
+
+def test_config_digest_ignores_the_location_of_the_config(tmpdir):
+    digests = []
+    for name in ('a', 'b'):
+        directory = tmpdir.mkdir(name)
+        directory.join('copyright.txt').write('(c) Example')
+        config = directory.join('wool_config.ini')
+        config.write('[Wool]\nprefix = com.example\n'
+                     'copyright = copyright.txt\nrender-cache = cache\n')
+        AKKA_WOOL.parse_config(str(config))
+        digests.append(AKKA_WOOL.config_digest())
+    assert digests[0] == digests[1]
+    assert '(c) Example' in digests[0]
+
+
+def test_cached_output_matches_rendered_output(tmpdir, generate):
+    config = 'beans-only = False\nrender-cache = %s\n' % tmpdir.join('cache')
+    files = generate(AKKA_WOOL, extra_config=config)
+    assert tmpdir.join('cache').visit(lambda path: path.isfile())
+    assert generate(AKKA_WOOL, extra_config=config) == files
@@ -0,0 +1,40 @@
+import pytest
+
+from wools.java.akka import WOOL as AKKA_WOOL
+from wools.java.jersey import WOOL as JERSEY_WOOL
+
+PACKAGE = 'src/com/example/bench/devices/'
+
+
+@pytest.mark.parametrize('route_metrics', [False, True])
+def test_route_metrics_wrap_routes(route_metrics, generate):
+    files = generate(AKKA_WOOL,
+                     extra_config='beans-only = False\n'
+                                  'route-metrics = %s\n' % route_metrics)
+    routes = files[PACKAGE + 'BdRoutes.java']
+    if route_metrics:
+        assert PACKAGE + 'BdRouteMetrics.java' in files
+        assert 'private Route timed(String route, Supplier<Route> inner) {' \
+            in routes
+        assert 'timed("device={name}/kind", () -> jsonMarshallOK(() -> ' \
+            'backend.getDeviceKind(name)))' in routes
+        assert 'public BdRoutes(BdInterface backend, BdRouteMetrics ' \
+            'metrics) {' in routes
+    else:
+        assert PACKAGE + 'BdRouteMetrics.java' not in files
+        assert 'timed(' not in routes
+        assert 'jsonMarshallOK(() -> backend.getDeviceKind(name))' in routes
+
+
+@pytest.mark.parametrize('route_metrics', [False, True])
+def test_jersey_route_metrics_wrap_resources(route_metrics, generate):
+    files = generate(JERSEY_WOOL,
+                     extra_config='beans-only = False\n'
+                                  'route-metrics = %s\n' % route_metrics)
+    routes = files[PACKAGE + 'BdRoutes.java']
+    if route_metrics:
+        assert 'return timed("device={name}/kind", () -> ' \
+            'backend.getDeviceKind(name));' in routes
+    else:
+        assert 'timed(' not in routes
+        assert 'return backend.getDeviceKind(name);' in routes
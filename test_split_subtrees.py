@@ -0,0 +1,39 @@
+from wools.java.akka import WOOL as AKKA_WOOL
+from wools.java.jersey import WOOL as JERSEY_WOOL
+
+PACKAGE = 'src/com/example/bench/devices/'
+
+
+def test_split_subtrees_generates_unit_per_root(generate):
+    files = generate(AKKA_WOOL, extra_config='beans-only = False\n'
+                                             'split-subtrees = True\n')
+    for unit, own, other in [('Config', 'getConfigPeer(', 'getDevice('),
+                             ('Device', 'getDevice(', 'getConfig(')]:
+        interface = files['%sBd%sInterface.java' % (PACKAGE, unit)]
+        routes = files['%sBd%sRoutes.java' % (PACKAGE, unit)]
+        assert 'public interface Bd%sInterface {' % unit in interface
+        assert own in interface and other not in interface
+        assert 'public Route getBd%sRoute() {' % unit in routes
+        assert 'backend.' + own in routes and other not in routes
+    interface = files[PACKAGE + 'BdInterface.java']
+    assert 'public interface BdInterface extends BdConfigInterface, ' \
+        'BdDeviceInterface {' in interface
+    assert 'get' not in interface[interface.index('public interface'):]
+    routes = files[PACKAGE + 'BdRoutes.java']
+    assert 'new BdConfigRoutes(backend).getBdConfigRoute(),' in routes
+    assert 'new BdDeviceRoutes(backend).getBdDeviceRoute());' in routes
+    # the backend implements the whole module interface
+    backend = files[PACKAGE + 'BdBackend.java']
+    assert 'getConfigPeer(' in backend and 'getDevice(' in backend
+
+
+def test_jersey_split_subtrees_registers_all_resources(generate):
+    files = generate(JERSEY_WOOL, extra_config='beans-only = False\n'
+                                               'split-subtrees = True\n')
+    assert PACKAGE + 'BdConfigRoutes.java' in files
+    assert PACKAGE + 'BdDeviceRoutes.java' in files
+    routes = files[PACKAGE + 'BdRoutes.java']
+    assert 'public static List<Object> resources(BdInterface backend) {' \
+        in routes
+    assert 'new BdConfigRoutes(backend),' in routes
+    assert 'new BdDeviceRoutes(backend));' in routes
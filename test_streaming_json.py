@@ -0,0 +1,40 @@
+import pytest
+
+from wools.java.akka import WOOL as AKKA_WOOL
+
+
+def test_streaming_json_reads_numbers_from_strings(generate):
+    models = {'bench-counters': """
+module bench-counters {
+  namespace "urn:bench:counters";
+  prefix bc;
+  container counters {
+    leaf octets { type uint64; }
+    leaf errors { type uint32; }
+  }
+}
+"""}
+    files = generate(AKKA_WOOL, models,
+                     'streaming-json = True\n[Types]\nuint64 = BigInteger\n')
+    counters = files['src/com/example/bench/counters/Counters.java']
+    assert 'octetsValue = (parser.getCurrentToken() == ' \
+        'JsonToken.VALUE_STRING ? new BigInteger(parser.getText().trim()) ' \
+        ': parser.getBigIntegerValue());' in counters
+    assert 'errorsValue = (parser.getCurrentToken() == ' \
+        'JsonToken.VALUE_STRING ? Integer.parseInt(parser.getText().trim()) ' \
+        ': parser.getIntValue());' in counters
+    assert 'import java.math.BigInteger;' in counters
+
+
+@pytest.mark.parametrize('streaming_json', [False, True])
+def test_streaming_json_registers_module_in_routes(streaming_json, generate):
+    files = generate(AKKA_WOOL,
+                     extra_config='beans-only = False\n'
+                                  'streaming-json = %s\n' % streaming_json)
+    routes = files['src/com/example/bench/devices/BdRoutes.java']
+    if streaming_json:
+        assert '.registerModule(new BdJsonModule());' in routes
+        assert ', Jackson.marshaller()' not in routes
+        assert 'Jackson.marshaller(MAPPER)' in routes
+    else:
+        assert 'MAPPER' not in routes
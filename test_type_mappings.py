@@ -0,0 +1,49 @@
+from wools.java import javaemitter
+from wools.java.akka import WOOL as AKKA_WOOL
+
+
+def test_type_mappings_import_their_classes(wrap):
+    models = {'bench-big': """
+module bench-big {
+  namespace "urn:bench:big";
+  prefix bb;
+  typedef big { type uint64; }
+  typedef small { type uint16; }
+  typedef tiny { type int8; }
+  leaf b { type big; }
+  leaf s { type small; }
+  leaf t { type tiny; }
+}
+"""}
+    module = wrap(AKKA_WOOL, models,
+                  '[DEFAULT]\nint8 = Object\n'
+                  '[Types]\nuint64 = BigInteger\nuint\\d+ = long\n')[0]
+    types = module.base_extensions()
+    assert types['Big'].type.java_type == 'BigInteger'
+    assert types['Small'].type.java_type == 'long'
+    assert types['Tiny'].type.java_type == 'int'
+    template = module.env.get_template('class_type.jinja')
+    expected = template.render(ctx=types['Big'], name='Big')
+    assert 'import java.math.BigInteger;' in expected
+    assert javaemitter.class_type(types['Big'], 'Big') == expected
+
+
+def test_type_mappings_keep_their_patterns(wrap):
+    models = {'bench-small': """
+module bench-small {
+  namespace "urn:bench:small";
+  prefix bs;
+  typedef small { type uint16; }
+  typedef large { type uint32; }
+  leaf s { type small; }
+  leaf l { type large; }
+}
+"""}
+    module = wrap(AKKA_WOOL, models,
+                  '[Types]\n(?P<bits>u?int(?:8|16)) = Short\n'
+                  'UINT32|uint32 = Long\n')[0]
+    types = module.base_extensions()
+    assert types['Small'].type.java_type == 'Short'
+    assert types['Large'].type.java_type == 'Long'
+    assert ('UINT32|uint32', 'Long') in \
+        AKKA_WOOL.data_type_mappings.patterns
@@ -0,0 +1,51 @@
+import pytest
+
+from wools.java.akka import WOOL as AKKA_WOOL
+from wools.java.jersey import WOOL as JERSEY_WOOL
+
+
+@pytest.mark.parametrize('wool', [AKKA_WOOL, JERSEY_WOOL],
+                         ids=lambda wool: wool.name)
+def test_union_template(wool, wrap):
+    compared = 0
+    for module in wrap(wool):
+        template = module.env.get_template('union.jinja')
+        for name, node in module.unions().items():
+            output = template.render(ctx=node, name=name)
+            assert '@JsonDeserialize(using = %s.Deserializer.class)' % name \
+                in output
+            members, _ = node.type.members()
+            assert len(members) == 2, name
+            for field, (java_type, _) in members.items():
+                assert 'public %s(%s %s) {' % (name, java_type, field) \
+                    in output
+            compared += 1
+    assert compared == 2
+
+
+@pytest.mark.parametrize('wool', [AKKA_WOOL, JERSEY_WOOL],
+                         ids=lambda wool: wool.name)
+def test_union_inline_enumeration(wool, wrap):
+    models = {'bench-power': """
+module bench-power {
+  namespace "urn:bench:power";
+  prefix bp;
+  typedef power {
+    type union {
+      type uint8;
+      type enumeration { enum auto; enum max-power; }
+    }
+  }
+  leaf level { type power; }
+}
+"""}
+    module = wrap(wool, models)[0]
+    node = module.unions()['Power']
+    members, _ = node.type.members()
+    assert members['enumerationValue'][0] == 'Enumeration'
+    output = module.env.get_template('union.jinja').render(ctx=node,
+                                                           name='Power')
+    assert 'public enum Enumeration {' in output
+    assert 'MAX_POWER("max-power")' in output
+    assert 'import com.fasterxml.jackson.annotation.JsonCreator;' in output
+    assert 'return new Power(Enumeration.fromJsonString(text));' in output
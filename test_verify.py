@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+
+from pyang.error import EmitError
+import pytest
+
+from wools.java.akka import WOOL as AKKA_WOOL
+
+# generates the test models in a new interpreter, with its own hash seed
+GENERATE = """
+import sys
+import py
+from pyang.error import EmitError
+from conftest import generated_files
+from wools.java.akka import WOOL
+try:
+    generated_files(WOOL, py.path.local(sys.argv[1]), extra_config=sys.argv[2])
+except EmitError as error:
+    sys.exit(error.exit_code)
+"""
+
+
+def test_verify_fails_the_emit_for_outdated_files(tmpdir, generate):
+    files = generate(AKKA_WOOL, extra_config='beans-only = True\n')
+    verify = 'beans-only = True\nverify = True\n'
+    assert generate(AKKA_WOOL, extra_config=verify) == files
+    changed = tmpdir.join('output', sorted(files)[0])
+    changed.write('changed')
+    stale = changed.dirpath().join('Stale.java')
+    stale.write('stale')
+    with pytest.raises(EmitError) as error:
+        generate(AKKA_WOOL, extra_config=verify)
+    assert error.value.exit_code == 1
+    assert error.value.msg == '2 generated files are not up to date'
+    assert changed.read() == 'changed'
+    assert stale.check()
+
+
+def test_verify_passes_under_other_hash_seeds(tmpdir):
+    config = 'beans-only = False\nbulk-fetch = True\nkey-classes = True\n'
+
+    def generate(seed, extra_config):
+        return subprocess.run(
+            [sys.executable, '-c', GENERATE, str(tmpdir), extra_config],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=dict(os.environ, PYTHONHASHSEED=seed),
+            stderr=subprocess.PIPE, universal_newlines=True)
+
+    assert generate('1', config).returncode == 0
+    assert tmpdir.join('output').visit(fil='*Routes.java')
+    for seed in ('2', '3'):
+        result = generate(seed, config + 'verify = True\n')
+        assert result.returncode == 0, result.stderr
@@ -6,6 +6,7 @@ import alpakka
 WOOL_PACKAGES = {
     'Java': 'wools.java',
     'Akka': 'wools.java.akka',
+    'Jersey': 'wools.java.jersey',
 }
 
 
@@ -1,7 +1,9 @@
-from wools.java.java_wool import JavaWool
-
-
-class AkkaWool(JavaWool):
-
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+from wools.java.java_wool import JavaWool
+from wools.java import javaemitter
+
+
+class AkkaWool(JavaWool):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.emitters = dict(javaemitter.EMITTERS)
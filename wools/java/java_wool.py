@@ -1,26 +1,126 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from alpakka import Wool
 from alpakka.logger import LOGGER
+from pyang.error import EmitError
 import configparser
+import os
+import re
+import sys
 
-TYPE_PATTERNS = {
+from . import javacache
+from . import javautils as ju
+
+# ordered, the first matching pattern determines the java type
+TYPE_PATTERNS = (
     (r"u?int\d*", "int"),
     (r"string", "String"),
     (r"boolean", "boolean"),
     (r"decimal64", "double"),
     (r"binary", "byte[]"),
     (r"empty", "Object"),
-}
+)
+
+
+class ModuleIndex:
+    """
+    Stand-in of a wrapped module in module-at-a-time mode. Only the module
+    statement and the lightweight index of the wrapped classes are kept, the
+    module is wrapped again when its output is generated.
+    """
+
+    def __init__(self, statement, classes):
+        self.statement = statement
+        # (origin module, child names, package) by name of the classes of the
+        # module, which are moved between the indexes like the wrapped classes
+        self.classes = classes
+        # names of the wrapped classes that are generated with this module
+        self.generated = set(classes)
+
+    def yang_module(self):
+        return self.statement.i_modulename
 
 
 class JavaWool(Wool):
 
     def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs, type_patterns=TYPE_PATTERNS)
+        super().__init__(*args, **kwargs)
+        self.data_type_mappings = ju.TypeResolver(TYPE_PATTERNS)
         self.beans_only = False
         self.copyright = None
         self.prefix = ""
         self.iface_levels = 100
+        self.query_params = False
+        self.key_classes = False
+        self.bulk_fetch = False
+        self.split_subtrees = False
+        self.route_metrics = False
+        self.entity_tags = False
+        self.streaming_json = False
+        self.fast_emitter = False
+        self.dedup_classes = False
+        self.caching_backend = False
+        # whether the methods of the backend interface return completion stages
+        self.async_backend = False
+        # whether only one wrapped module is kept at a time, see ModuleIndex
+        self.module_at_a_time = False
+        # the return type of the rpc methods of the backend interface
+        self.rpc_type = 'Route'
+        # canonical class names by (package, class name) of merged classes
+        self.class_aliases = {}
+        # emitters replacing the templates of this wool, by template name
+        self.emitters = {}
+        self.render_cache = None
+        self.verify = False
+        # generated files by path, collected in verify mode
+        self.rendered = OrderedDict()
+        self.verified = set()
+        self.problems = OrderedDict()
+        # modules whose output is not verified yet
+        self.pending = set()
+
+    def template_paths(self):
+        """
+        Collects the template directories of this wool, relative to the
+        ``wools`` package, in the order they are searched for templates.
+
+        :return: list of template directories
+        """
+        path = '/templates'
+        item = self
+        while item.name != 'default':
+            path = '/' + item.name[0].lower() + item.name[1:] + path
+            item = item.parent
+        return [path]
+
+    def __getitem__(self, name):
+        """
+        Gets the wrapper class of a yang statement. In module-at-a-time mode
+        the alpakka plugin gets the module indexes instead of the wrapped
+        modules, which are passed to wrapping_postprocessing and
+        generate_output.
+
+        :param name: the yang statement
+        :return: the wrapper class
+        """
+        if name == 'module' and self.module_at_a_time:
+            return self.index_module
+        return super().__getitem__(name)
+
+    def index_module(self, statement):
+        """
+        Wraps the module statement to extract the index of its classes and
+        drops the wrapped module again.
+
+        :param statement: the module statement
+        :return: the module index
+        """
+        module = super().__getitem__('module')(statement)
+        return ModuleIndex(statement, OrderedDict(
+            (name, (child.statement.i_orig_module.arg,
+                    frozenset(child.children.keys()), child.package()))
+            for name, child in module.classes.items()))
 
     def generate_output(self, module):
         """
@@ -28,6 +128,16 @@ class JavaWool(Wool):
 
         :return:
         """
+        beans = None
+        if isinstance(module, ModuleIndex):
+            index = module
+            module = super().__getitem__('module')(index.statement)
+            for name in set(module.classes) - index.generated:
+                module.classes.pop(name)
+            beans = sorted((name, package) for name, (_, _, package)
+                           in index.classes.items())
+        if self.dedup_classes:
+            self.deduplicate_classes(module)
         # generate enum classes
         module.fill_template('enum_type.jinja', module.enums())
         # generate class extensions
@@ -36,8 +146,23 @@ class JavaWool(Wool):
         module.fill_template('class_type.jinja', module.base_extensions())
         # generate classes
         module.fill_template('grouping.jinja', module.classes)
+        if self.streaming_json:
+            # register the streaming serializers of the classes
+            module.fill_template('json_module.jinja', {
+                '%sJsonModule' % module.java_name: {
+                    'path': module.subpath(),
+                    'package': module.package(),
+                    'module': module,
+                    'beans': beans if beans is not None else sorted(
+                        (name, node.package())
+                        for name, node in module.classes.items())}})
         # generate unions
         module.fill_template('union.jinja', module.unions())
+        # generate bits
+        module.fill_template('bits_type.jinja', module.bits())
+        if self.key_classes:
+            # generate key classes of lists
+            module.fill_template('list_key.jinja', module.list_keys())
         if not self.beans_only:
             if_name = '%sInterface' % module.java_name
             rpc_imports = {imp for rpc in module.rpcs.values()
@@ -50,20 +175,83 @@ class JavaWool(Wool):
                                 child.java_imports.imports:
                             rpc_imports.update(
                                 child.java_imports.get_imports())
+            if self.query_params:
+                rpc_imports.add('java.util.Set')
+            if self.bulk_fetch:
+                rpc_imports.add('java.util.List')
             rpc_dict = {'rpcs': module.rpcs,
                         'imports': rpc_imports,
                         'package': module.package(),
                         'path': module.subpath(),
                         'module': module,
-                        'levels': self.iface_levels}
+                        'levels': self.iface_levels,
+                        'query_params': self.query_params,
+                        'bulk_fetch': self.bulk_fetch,
+                        'roots': module.get_root_elements(),
+                        'extends': [],
+                        'subtrees': [],
+                        'route_name': module.java_name,
+                        'route_metrics': self.route_metrics,
+                        'entity_tags': self.entity_tags,
+                        'async_backend': self.async_backend,
+                        'metrics_name': '%sRouteMetrics' % module.java_name}
+            if self.route_metrics:
+                module.fill_template('route_metrics.jinja', {
+                    rpc_dict['metrics_name']: rpc_dict})
+            if self.split_subtrees:
+                self.generate_subtrees(module, rpc_dict)
             module.fill_template('backend_interface.jinja', {
                 if_name: rpc_dict})
             rpc_dict['interface_name'] = if_name
+            # the backend implements the whole module interface
             module.fill_template('backend_impl.jinja', {
                 '%sBackend' % module.java_name: rpc_dict})
+            if self.caching_backend:
+                # read-through caching decorator of the backend interface
+                module.fill_template('caching_backend.jinja', {
+                    '%sCachingBackend' % module.java_name: rpc_dict})
             module.fill_template('routes.jinja', {
                 '%sRoutes' % module.java_name: rpc_dict})
+            indexed_lists = module.indexed_lists(self.iface_levels)
+            if self.key_classes and indexed_lists:
+                index_imports = set(rpc_imports)
+                for _, node in indexed_lists:
+                    index_imports.update(node.java_imports.get_imports())
+                    index_imports.add('%s.%s' % (node.package(),
+                                                 node.key_type))
+                rpc_dict['imports'] = index_imports
+                module.fill_template('indexed_backend.jinja', {
+                    '%sIndexedBackend' % module.java_name: rpc_dict})
         module.generate_pom('pom.jinja', module)
+        if self.verify:
+            self.verify_output()
+            self.pending.discard(module.yang_module())
+            if not self.pending:
+                # the stale files are only known after the last module
+                self.exit_verified()
+
+    def generate_subtrees(self, module, rpc_dict):
+        """
+        Generates a separate backend interface and routes class for every root
+        element of the module, so they can be compiled independently. The
+        given context is turned into the one of the thin module interface and
+        routes, which aggregate the subtree ones.
+
+        :param module: module the output is generated for
+        :param rpc_dict: template context of the module interface and routes
+        """
+        for name, root in rpc_dict['roots'].items():
+            unit_name = module.java_name + ju.firstupper(ju.to_java_name(name))
+            unit_dict = dict(rpc_dict, rpcs={}, roots={name: root},
+                             extends=[], subtrees=[], route_name=unit_name)
+            module.fill_template('backend_interface.jinja', {
+                '%sInterface' % unit_name: unit_dict})
+            unit_dict['interface_name'] = '%sInterface' % unit_name
+            module.fill_template('routes.jinja', {
+                '%sRoutes' % unit_name: unit_dict})
+            rpc_dict['extends'].append(unit_dict['interface_name'])
+            rpc_dict['subtrees'].append(unit_name)
+        rpc_dict['roots'] = {}
 
     def wrapping_postprocessing(self, module, wrapped_modules):
         """
@@ -74,6 +262,11 @@ class JavaWool(Wool):
         :param wrapped_modules: dictionary of all modules
         :return:
         """
+        if self.verify:
+            self.pending.update(wrapped_modules)
+        if isinstance(module, ModuleIndex):
+            self.index_postprocessing(module, wrapped_modules)
+            return
         for name, child in set(module.classes.items()):
             orig_mod_name = child.statement.i_orig_module.arg
             if orig_mod_name != module.yang_module():
@@ -88,6 +281,219 @@ class JavaWool(Wool):
                     orig_mod.classes[name] = child
                 module.classes.pop(name)
 
+    def index_postprocessing(self, module, wrapped_modules):
+        """
+        Applies wrapping_postprocessing to the module indexes. The classes
+        moved to the module they originate from are still generated with the
+        module that wraps them.
+
+        :param module: module index that postprocessing is applied to
+        :param wrapped_modules: dictionary of all module indexes
+        :return:
+        """
+        for name, entry in list(module.classes.items()):
+            orig_mod_name = entry[0]
+            if orig_mod_name != module.yang_module():
+                orig_mod = wrapped_modules[orig_mod_name]
+                if name in orig_mod.classes:
+                    diff = list(entry[1] ^ orig_mod.classes[name][1])
+                    if diff:
+                        LOGGER.warn(
+                            "Different attributes detected when merging "
+                            "%s: %s", name, diff)
+                    module.generated.discard(name)
+                else:
+                    orig_mod.classes[name] = entry
+                module.classes.pop(name)
+
+    def deduplicate_classes(self, module):
+        """
+        Merges the structurally identical classes of the module, e.g. list
+        and case classes reached through different paths or augments. The
+        classes are grouped by their shape, see class_shape, which is
+        repeated until no more classes are merged, as merged member classes
+        can make their parents identical. The grouping or else the first
+        class by name of each shape is generated, the others become aliases
+        of it and the references of all wrapped nodes are changed to the
+        generated class.
+
+        Only classes that originate in the module and are not groupings are
+        replaced by aliases, as others can be referenced by other modules.
+        References of other modules to merged classes are changed when these
+        modules are generated afterwards.
+
+        :param module: the wrapped module
+        :return:
+        """
+        package = module.package()
+        nodes = module.wrapped_nodes()
+        self.apply_class_aliases(nodes)
+        while True:
+            shapes = OrderedDict()
+            for name, node in module.classes.items():
+                shapes.setdefault(self.class_shape(node), []).append(name)
+            aliases = {}
+            for names in shapes.values():
+                # groupings are kept, they can be used by other modules
+                canonical = min(names, key=lambda name: (
+                    module.classes[name].yang_type() != 'grouping', name))
+                for name in names:
+                    node = module.classes[name]
+                    if name != canonical and \
+                            node.yang_type() != 'grouping' and \
+                            node.statement.i_orig_module.arg == \
+                            module.yang_module():
+                        aliases[package, name] = canonical
+            if not aliases:
+                break
+            for (_, name), canonical in sorted(aliases.items()):
+                LOGGER.debug("Merging class %s into %s", name, canonical)
+                node = module.classes.pop(name)
+                key_type = getattr(node, 'key_type', None)
+                if key_type:
+                    self.class_aliases[package, key_type] = getattr(
+                        module.classes[canonical], 'key_type', key_type)
+            self.class_aliases.update(aliases)
+            self.apply_class_aliases(nodes)
+
+    @staticmethod
+    def class_shape(node):
+        """
+        Computes the structural shape of a class, i.e. everything the
+        generated class depends on apart from its name and descriptions: the
+        names, fully qualified java types and kinds of the variables and the
+        list keys.
+
+        :param node: the wrapped node of the class
+        :return: hashable tuple
+        """
+        return (bool(node.uses), tuple(getattr(node, 'keys', None) or ()),
+                tuple(sorted(getattr(node, 'vars', {}))),
+                tuple(sorted(
+                    (key, var.yang_name(), JavaWool.qualified_type(var),
+                     getattr(var, 'group', None),
+                     bool(getattr(var, 'is_build_in_type', False)))
+                    for key, var in node.all_vars.items())))
+
+    @staticmethod
+    def qualified_type(var):
+        """
+        Qualifies the classes of the java type of a variable with the
+        packages they are imported from, e.g. List<com.example.Item>, as
+        classes of different packages can have the same name.
+
+        :param var: the wrapped variable
+        :return: the qualified java type or None
+        """
+        java_type = getattr(var, 'java_type', None)
+        if not java_type:
+            return java_type
+        imports = getattr(getattr(var, 'java_imports', None), 'imports', {})
+        packages = {name: package
+                    for package, names in sorted(imports.items())
+                    for name in names}
+        return re.sub(r'\w+', lambda match: '.'.join(
+            filter(None, (packages.get(match.group()), match.group()))),
+            java_type)
+
+    def apply_class_aliases(self, nodes):
+        """
+        Changes the references of the given nodes to merged classes to the
+        generated classes.
+
+        :param nodes: list of wrapped nodes
+        :return:
+        """
+        if not self.class_aliases:
+            return
+        for node in nodes:
+            imports = getattr(node, 'java_imports', None)
+            for package, names in getattr(imports, 'imports', {}).items():
+                for name in list(names):
+                    canonical = self.class_aliases.get((package, name))
+                    if canonical is None:
+                        continue
+                    names.discard(name)
+                    names.add(canonical)
+                    for attr, pattern in (('java_type', '%s'),
+                                          ('java_type', 'List<%s>'),
+                                          ('element_type', '%s')):
+                        if getattr(node, attr, None) == pattern % name:
+                            setattr(node, attr, pattern % canonical)
+            key_type = getattr(node, 'key_type', None)
+            if key_type:
+                node.key_type = self.class_aliases.get(
+                    (node.package(), key_type), key_type)
+
+    def verify_output(self):
+        """
+        Compares the java files collected in verify mode to the existing
+        files, first by size and then by hash, in parallel. The compared files
+        are dropped afterwards, only their paths are kept for the stale check.
+        The pom is compared at the end, as it is overwritten by every module.
+
+        :return:
+        """
+        paths = [path for path in self.rendered if path.endswith('.java')]
+        with ThreadPoolExecutor() as executor:
+            results = executor.map(ju.compare_file, paths,
+                                   (self.rendered.pop(path) for path in paths))
+            for path, result in zip(paths, results):
+                self.verified.add(path)
+                if result:
+                    self.problems[path] = result
+
+    def exit_verified(self):
+        """
+        Reports the result of the verify mode after the last module and fails
+        the emit of pyang, i.e. exits with status 1, if the generated files
+        differ, are missing or are stale, i.e. existing java files in the
+        generated directories that are not generated anymore. The collected
+        files are reset, so the wool can verify another generation.
+        """
+        for path, output in self.rendered.items():
+            result = ju.compare_file(path, output)
+            if result:
+                self.problems[path] = result
+        for directory in sorted({os.path.dirname(path)
+                                 for path in self.verified}):
+            if not os.path.isdir(directory):
+                continue
+            for file_name in sorted(os.listdir(directory)):
+                path = "%s/%s" % (directory, file_name)
+                if file_name.endswith('.java') and path not in self.verified:
+                    self.problems[path] = 'stale'
+        problems = self.problems
+        count = len(self.verified) + len(self.rendered)
+        self.rendered, self.verified = OrderedDict(), set()
+        self.problems = OrderedDict()
+        for path, problem in problems.items():
+            print("%s: %s" % (problem, path), file=sys.stderr)
+        if problems:
+            raise EmitError("%d generated files are not up to date" %
+                            len(problems))
+        LOGGER.info("All %d generated files are up to date", count)
+
+    def config_digest(self):
+        """
+        Collects the configuration of the wool that affects the generated
+        output, as part of the render cache keys.
+
+        :return: JSON compatible list of the configuration values
+        """
+        result = [self.name]
+        for key, value in sorted(vars(self).items()):
+            # the copyright is included by its content instead of its path,
+            # which depends on the checkout of the configuration
+            if isinstance(value, (bool, int, str)) and key not in (
+                    'output_path', 'verify', 'fast_emitter', 'copyright'):
+                result.append([key, value])
+        result.append(self.data_type_mappings.patterns)
+        if self.copyright:
+            with open(self.copyright, 'r') as copyright_file:
+                result.append(copyright_file.read())
+        return result
+
     def parse_config(self, path):
         """
         Loads the configuration from the given path and stores the values in
@@ -108,3 +514,50 @@ class JavaWool(Wool):
         self.iface_levels = wool_config.getint('interface-levels',
                                                fallback=self.iface_levels)
         self.prefix = wool_config.get('prefix', fallback=self.prefix)
+        self.query_params = wool_config.getboolean(
+            'query-parameters', fallback=self.query_params)
+        self.key_classes = wool_config.getboolean(
+            'key-classes', fallback=self.key_classes)
+        self.bulk_fetch = wool_config.getboolean(
+            'bulk-fetch', fallback=self.bulk_fetch)
+        self.split_subtrees = wool_config.getboolean(
+            'split-subtrees', fallback=self.split_subtrees)
+        self.route_metrics = wool_config.getboolean(
+            'route-metrics', fallback=self.route_metrics)
+        self.entity_tags = wool_config.getboolean(
+            'entity-tags', fallback=self.entity_tags)
+        self.streaming_json = wool_config.getboolean(
+            'streaming-json', fallback=self.streaming_json)
+        self.fast_emitter = wool_config.getboolean(
+            'fast-emitter', fallback=self.fast_emitter)
+        self.dedup_classes = wool_config.getboolean(
+            'deduplicate-classes', fallback=self.dedup_classes)
+        self.caching_backend = wool_config.getboolean(
+            'caching-backend', fallback=self.caching_backend)
+        self.async_backend = wool_config.getboolean(
+            'async-backend', fallback=self.async_backend)
+        self.module_at_a_time = wool_config.getboolean(
+            'module-at-a-time', fallback=self.module_at_a_time)
+        if self.module_at_a_time and self.dedup_classes:
+            # the classes of other modules are not wrapped at the same time
+            raise ValueError("deduplicate-classes is not supported together "
+                             "with module-at-a-time")
+        self.verify = wool_config.getboolean('verify', fallback=self.verify)
+        if config.has_option('Wool', 'render-cache'):
+            # maximum size in megabytes
+            size = wool_config.getint('render-cache-size', fallback=256)
+            self.render_cache = javacache.DirectoryRenderCache(
+                str(ppath.joinpath(wool_config['render-cache'])),
+                size * 1024 * 1024)
+        if config.has_section('Types'):
+            # additional mappings from yang base type patterns to java types,
+            # in the order of the file and without the [DEFAULT] values, the
+            # patterns are read as they are, only split at the first '='
+            types = configparser.ConfigParser(interpolation=None,
+                                              delimiters=('=',))
+            types.optionxform = str
+            types.read(path)
+            defaults = types.defaults()
+            for pattern, java_type in types.items('Types'):
+                if pattern not in defaults:
+                    self.data_type_mappings.add_pattern(pattern, java_type)
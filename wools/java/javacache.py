@@ -0,0 +1,270 @@
+from alpakka.logger import LOGGER
+from pyang.statements import Statement
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# suffix of the files being written, the keys are hex digests
+TMP_SUFFIX = '.tmp'
+# age in seconds after which files being written are considered abandoned
+TMP_MAX_AGE = 60 * 60
+# share of the maximum size the cache is reduced to by an eviction
+LOW_WATER_MARK = 0.9
+
+
+class RenderCache:
+    """
+    Interface of the render cache backends. The cache maps content addressed
+    keys, i.e. hex digests of everything the rendered output depends on, to
+    the rendered output.
+    """
+
+    def get(self, key):
+        """
+        Looks up the rendered output for the given key.
+
+        :param key: the hex digest of the render input
+        :return: the rendered output or None if it is not cached
+        """
+        raise NotImplementedError
+
+    def put(self, key, output):
+        """
+        Stores the rendered output for the given key.
+
+        :param key: the hex digest of the render input
+        :param output: the rendered output
+        """
+        raise NotImplementedError
+
+
+class DirectoryRenderCache(RenderCache):
+    """
+    Render cache storing one file per key in a local directory, which can
+    also be a shared mount used by several build machines. Entries are
+    written atomically and the least recently used ones are evicted as soon
+    as the directory grows beyond the maximum size, down to the low water
+    mark, so the directory is not scanned again on every write. Files that
+    are still being written, possibly by another process, are never evicted.
+    The entries are readable by all users that the umask allows, like files
+    written by other tools.
+
+    >>> temporary = tempfile.TemporaryDirectory()
+    >>> directory = temporary.name
+    >>> cache = DirectoryRenderCache(directory, max_size=15)
+    >>> cache.get('0123') is None
+    True
+    >>> cache.put('0123', 'class A {}')
+    >>> cache.put('4567', 'class B {}')
+    >>> oct(os.stat(cache.path('4567')).st_mode & 0o777) == oct(cache.mode)
+    True
+    >>> cache.get('0123') is None
+    True
+    >>> cache.get('4567')
+    'class B {}'
+    >>> pending = os.path.join(directory, '89', '89ab' + TMP_SUFFIX)
+    >>> os.makedirs(os.path.dirname(pending))
+    >>> with open(pending, 'w') as f:
+    ...     _ = f.write('class C {}')
+    >>> cache.put('cdef', 'class D {}')
+    >>> os.path.exists(pending), cache.get('4567') is None
+    (True, True)
+    >>> open(os.path.join(directory, 'ff'), 'w').close()
+    >>> cache.put('ffff', 'class E {}')
+    >>> cache.get('ffff') is None
+    True
+    >>> temporary.cleanup()
+    """
+
+    def __init__(self, directory, max_size=256 * 1024 * 1024):
+        """
+        :param directory: the cache directory, created if it does not exist
+        :param max_size: the maximum size of all entries in bytes
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+        # mkstemp creates files only readable by the owner
+        umask = os.umask(0)
+        os.umask(umask)
+        self.mode = 0o666 & ~umask
+        # only tracks the entries written by this process since the last
+        # eviction, which recomputes it from the directory
+        self.size = sum(size for _, _, size in self.entries())
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def entries(self):
+        """
+        Lists the cache entries, without the files being written.
+
+        :return: list of (access time, path, size) tuples
+        """
+        result = []
+        for root, _, files in os.walk(self.directory):
+            for file_name in files:
+                if file_name.endswith(TMP_SUFFIX):
+                    continue
+                path = os.path.join(root, file_name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    # evicted concurrently
+                    continue
+                result.append((stat.st_mtime, path, stat.st_size))
+        return result
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                output = f.read()
+        except OSError:
+            return None
+        try:
+            # the modification time tracks the last access for eviction
+            os.utime(path)
+        except OSError:
+            # e.g. an entry of another user on a shared directory
+            LOGGER.debug("Cache entry access not tracked: %s", path)
+        return output
+
+    def put(self, key, output):
+        path = self.path(key)
+        data = output.encode('utf-8')
+        tmp_path = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path),
+                                                suffix=TMP_SUFFIX)
+            with os.fdopen(handle, 'wb') as f:
+                f.write(data)
+            os.chmod(tmp_path, self.mode)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # the output is rendered again on the next run
+            LOGGER.debug("Cache entry not written: %s (%s)", path, e)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.size += len(data)
+        if self.size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the cache is reduced to
+        the low water mark of its maximum size, as well as the files being
+        written that were abandoned by crashed processes.
+        """
+        self.remove_abandoned()
+        entries = sorted(self.entries())
+        self.size = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if self.size <= self.max_size * LOW_WATER_MARK:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                LOGGER.debug("Cache entry already evicted: %s", path)
+            self.size -= size
+
+    def remove_abandoned(self):
+        """
+        Removes the files being written that are older than TMP_MAX_AGE.
+        """
+        expiry = time.time() - TMP_MAX_AGE
+        for root, _, files in os.walk(self.directory):
+            for file_name in files:
+                if not file_name.endswith(TMP_SUFFIX):
+                    continue
+                path = os.path.join(root, file_name)
+                try:
+                    if os.stat(path).st_mtime < expiry:
+                        os.remove(path)
+                except OSError:
+                    # renamed or removed concurrently
+                    continue
+
+
+def serialize_context(value, seen=None):
+    """
+    Converts a render context, i.e. a wrapped node, into a JSON compatible
+    structure that only depends on the content of the node. Parents are
+    reduced to the path of their statement arguments and modules to their
+    names, so unrelated parts of the yang tree do not affect the result.
+
+    >>> serialize_context({'b': {1, 2}, 'a': [None, 'x']})
+    [['b', [1, 2]], ['a', [None, 'x']]]
+
+    :param value: the value to be serialized
+    :param seen: ids of the objects being serialized, to break cycles
+    :return: the serialized structure
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return ['cycle', type(value).__name__]
+    seen.add(id(value))
+    try:
+        if isinstance(value, Statement):
+            return [str(value.keyword), value.arg,
+                    [serialize_context(sub, seen) for sub in value.substmts]]
+        if hasattr(value, 'classes') and hasattr(value, 'yang_module'):
+            return ['module', value.yang_module()]
+        if isinstance(value, dict):
+            return [[str(key), serialize_context(item, seen)]
+                    for key, item in value.items()]
+        if isinstance(value, (set, frozenset)):
+            return sorted((serialize_context(item, seen) for item in value),
+                          key=json.dumps)
+        if isinstance(value, (list, tuple)):
+            return [serialize_context(item, seen) for item in value]
+        if hasattr(value, '__dict__'):
+            result = [type(value).__name__]
+            for key, item in sorted(vars(value).items()):
+                if key == 'parent':
+                    item = parent_path(item)
+                result.append([key, serialize_context(item, seen)])
+            return result
+        return repr(value)
+    finally:
+        seen.discard(id(value))
+
+
+def parent_path(node):
+    """
+    Collects the statement arguments from the given node up to the root.
+
+    :param node: the wrapped node
+    :return: list of statement arguments
+    """
+    path = []
+    while node is not None:
+        statement = getattr(node, 'statement', None)
+        path.append(statement.arg if statement is not None else None)
+        node = getattr(node, 'parent', None)
+    return path
+
+
+def render_key(*parts):
+    """
+    Computes the content addressed key of a rendered output.
+
+    >>> render_key('grouping.jinja', ['x']) == render_key('grouping.jinja',
+    ...                                                   ['x'])
+    True
+    >>> render_key('a', 'b') == render_key('ab')
+    False
+
+    :param parts: JSON compatible parts the output depends on
+    :return: hex digest of the parts
+    """
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode(
+        'utf-8')).hexdigest()
@@ -0,0 +1,326 @@
+from jinja2.filters import do_indent
+
+from . import javautils as ju
+
+# The emitters build the output of the bean templates directly from the
+# wrapped nodes, without the generic rendering overhead of jinja. Each one
+# must produce exactly the same output as its template, which is checked by
+# test_javaemitter.py, so changes of the templates need to be applied to
+# the emitters as well.
+
+
+def class_description(description):
+    """
+    Creates the javadoc comment of the class_description macro of fub.jinja.
+
+    >>> print(class_description('First line\\nsecond line'))
+    /**
+     * First line
+     * second line
+     */
+    >>> class_description(None)
+    ''
+
+    :param description: the description of the node or None
+    :return: the comment or an empty string
+    """
+    if not description:
+        return ''
+    return '/**\n * %s\n */' % do_indent(
+        str(description).replace('\n', '\n* '), 1)
+
+
+def description(node):
+    return class_description(getattr(node, 'description', None))
+
+
+def is_list(var):
+    return 'list' in (getattr(var, 'group', None) or ())
+
+
+def element_type(var):
+    return ju.java_boxed(var.java_type[5:-1] or 'Object')
+
+
+def default_value(var):
+    """
+    Determines the shared default of an unset variable, like the
+    default_value macro of grouping.jinja.
+
+    :param var: the wrapped variable
+    :return: the java expression or an empty string for unions
+    """
+    data_type = getattr(var, 'type', None)
+    inner = getattr(data_type, 'type', None) if data_type else None
+    if data_type and getattr(data_type, 'data_type', None) == 'enumeration':
+        first_name, first_enum = next(iter(inner.enums.items()))
+        return '%s.%s' % (var.java_type, first_enum.javaname or first_name)
+    if inner and getattr(inner, 'group', None) == 'bits':
+        return '%s.EMPTY' % var.java_type
+    if not (inner and getattr(inner, 'group', None) == 'union'):
+        return '%s.DEFAULT' % var.java_type
+    return ''
+
+
+def grouping(ctx, name):
+    """
+    Emits the output of grouping.jinja.
+
+    :param ctx: the wrapped grouping
+    :param name: the name of the class
+    :return: the java source or None if the configuration of the wool needs
+             features the emitter does not support
+    """
+    if ctx.WOOL.streaming_json:
+        return None
+    variables = ctx.all_vars
+    var_items = sorted(variables.items(), key=lambda item: item[0])
+    out = [str(ctx.top().get_copy_right()),
+           '\npackage %s;\n\n' % ctx.package(),
+           'import java.io.Serializable;\n'
+           'import java.util.Objects;\n\n'
+           'import com.fasterxml.jackson.annotation.JsonCreator;\n'
+           'import com.fasterxml.jackson.annotation.JsonInclude;\n'
+           'import com.fasterxml.jackson.annotation.JsonInclude.Include;']
+    if ctx.uses or variables:
+        out.append('\nimport com.fasterxml.jackson.annotation.JsonProperty;')
+    out.append('\n')
+    imports = ctx.imports()
+    if imports:
+        out.append('\n')
+        out.extend('import %s;\n' % import_ for import_ in sorted(imports))
+    out.append('\n%s\n@JsonInclude(Include.NON_NULL)\n'
+               'public class %s implements Serializable {\n\n'
+               '  private static final long serialVersionUID = 1L;\n' % (
+                   description(ctx), name))
+    for key, var in var_items:
+        out.append('\n%s\n  private final %s %s;\n' % (
+            do_indent(description(var), 2, True), var.java_type, key))
+    out.append('\n\n  @JsonCreator\n  public %s (\n    ' % name)
+    out.append(',\n    '.join('@JsonProperty("%s") %s %s' % (
+        var.yang_name(), var.java_type, key) for key, var in var_items))
+    out.append('){')
+    for key, var in var_items:
+        out.append('\n    this.%s = %s' % (key, key))
+        if is_list(var):
+            out.append(' != null ? ImmutableList.copyOf(%s) : '
+                       'ImmutableList.of()' % key)
+        out.append(';')
+    out.append('\n  }\n\n')
+    for key, var in var_items:
+        out.append('\n  @JsonProperty("%s")\n'
+                   '  public %s get%s(){\n'
+                   '    return this.%s;\n'
+                   '  }\n' % (var.yang_name(), var.java_type,
+                              ju.firstupper(key), key))
+    out.append('\n\n  /**\n'
+               '   * The value built without setting any field, shared as'
+               ' default of the fields of this type.\n'
+               '   */\n'
+               '  public static final %s DEFAULT = new Builder().build();\n\n'
+               '  public static class Builder {' % name)
+    for key, var in var_items:
+        if is_list(var):
+            out.append('\n    private ImmutableList.Builder<%s> %s;' % (
+                element_type(var), key))
+        else:
+            out.append('\n    private %s %s' % (var.java_type, key))
+            if getattr(var, 'is_build_in_type', None):
+                out.append(' = %s' % ju.java_default(var.java_type))
+            out.append(';')
+    out.append('\n\n    public Builder() {}\n\n  ')
+    for key, var in var_items:
+        out.append('\n    public Builder %s(%s %s){' % (
+            ju.firstlower(key), var.java_type, key))
+        if is_list(var):
+            out.append('\n      this.%s = %s != null ? ImmutableList.<%s>'
+                       'builder().addAll(%s) : null;' % (
+                           key, key, element_type(var), key))
+        else:
+            out.append('\n      this.%s = %s;' % (key, key))
+        out.append('\n      return this;\n    }\n  ')
+        if is_list(var):
+            out.append('\n    public Builder add%s(%s element){\n'
+                       '      if (this.%s == null) {\n'
+                       '        this.%s = ImmutableList.builder();\n'
+                       '      }\n'
+                       '      this.%s.add(element);\n'
+                       '      return this;\n'
+                       '    }\n  ' % (ju.firstupper(key), element_type(var),
+                                      key, key, key))
+    out.append('\n\n    public %s build() {' % name)
+    for key, var in var_items:
+        if not getattr(var, 'is_build_in_type', None) and \
+                not is_list(var) and default_value(var):
+            out.append('\n      this.%s = this.%s != null ? this.%s : %s;' % (
+                key, key, key, default_value(var)))
+    out.append('\n      return new %s(' % name)
+    out.append(', '.join('buildList(%s)' % key if is_list(var) else key
+                         for key, var in var_items))
+    out.append(');\n    }')
+    if any(is_list(var) for _, var in var_items):
+        out.append('\n\n    private static <T> ImmutableList<T> buildList('
+                   'ImmutableList.Builder<T> builder) {\n'
+                   '      return builder != null ? builder.build() : '
+                   'ImmutableList.of();\n'
+                   '    }')
+    out.append('\n\n  }\n\n  @Override\n  public int hashCode() {\n'
+               '    return Objects.hash(')
+    if ctx.uses:
+        out.append('super.hashCode()')
+        if variables:
+            out.append(', ')
+    out.append(', '.join(key for key, _ in var_items))
+    out.append(');\n  }\n\n'
+               '  @Override\n'
+               '  public boolean equals(Object o) {\n'
+               '    if (this == o) {\n'
+               '      return true;\n'
+               '    }\n'
+               '    if (o == null || getClass() != o.getClass()) {\n'
+               '      return false;\n'
+               '    }')
+    if variables:
+        out.append('\n    %s that = (%s) o;' % (name, name))
+    if ctx.uses or variables:
+        out.append('\n    return')
+        if ctx.uses:
+            out.append(' super.equals(o)')
+            if variables:
+                out.append(' &&\n      ')
+        out.append(' &&\n      '.join(
+            ' Objects.equals(this.%s, that.%s)' % (key, key)
+            for key, _ in var_items))
+        out.append(';')
+    else:
+        out.append('\n    return true;')
+    out.append('\n  }\n\n}')
+    return ''.join(out)
+
+
+def class_type(ctx, name):
+    """
+    Emits the output of class_type.jinja.
+
+    :param ctx: the wrapped typedef of a base type
+    :param name: the name of the class
+    :return: the java source
+    """
+    varname = ju.firstlower(name)
+    java_type = ctx.type.java_type
+    imports = ctx.type.java_imports.get_imports()
+    if ctx.type.java_cast:
+        hash_code = '((%s) %s).hashCode()' % (ctx.type.java_cast, varname)
+    else:
+        hash_code = '%s.hashCode()' % varname
+    return (
+        '%(copyright)s\n'
+        'package %(package)s;\n\n'
+        'import java.util.Objects;\n\n'
+        'import java.io.Serializable;\n'
+        '%(imports)s\n'
+        'import com.fasterxml.jackson.annotation.JsonValue;\n\n'
+        '%(description)s\n'
+        'public class %(name)s implements Serializable {\n\n\n'
+        '  private static final long serialVersionUID = 1L;\n'
+        '  private final %(type)s %(var)s;\n\n'
+        '  public %(name)s(%(type)s %(var)s) {\n'
+        '    this.%(var)s = %(var)s;\n'
+        '  }\n\n'
+        '  @JsonValue\n'
+        '  public %(type)s get%(name)s(){\n'
+        '    return %(var)s;\n'
+        '  }\n\n'
+        '  /**\n'
+        '   * The value built without setting it, shared as default of the'
+        ' fields of this type.\n'
+        '   */\n'
+        '  public static final %(name)s DEFAULT = new Builder().build();\n\n'
+        '  public static class Builder {\n\n'
+        '    private %(type)s %(var)s = %(default)s;\n\n'
+        '    public Builder() {}\n\n'
+        '    public Builder %(var)s(%(type)s %(var)s){\n'
+        '      this.%(var)s = %(var)s;\n'
+        '      return this;\n'
+        '    }\n\n'
+        '    public %(name)s build() {\n'
+        '      return new %(name)s(%(var)s);\n'
+        '    }\n\n'
+        '  }\n\n'
+        '  @Override\n'
+        '  public int hashCode() {\n'
+        '    return %(hash_code)s;\n'
+        '  }\n\n'
+        '  @Override\n'
+        '  public boolean equals(Object o) {\n'
+        '    if (this == o) {\n'
+        '      return true;\n'
+        '    }\n'
+        '    if (o == null || getClass() != o.getClass()) {\n'
+        '      return false;\n'
+        '    }\n'
+        '    %(name)s that = (%(name)s) o;\n'
+        '    return Objects.equals(this.%(var)s, that.%(var)s);\n'
+        '  }\n\n'
+        '}') % {'copyright': ctx.top().get_copy_right(),
+                'package': ctx.package(),
+                'imports': ''.join('import %s;\n' % import_
+                                   for import_ in sorted(imports)),
+                'description': description(ctx),
+                'name': name,
+                'type': java_type,
+                'var': varname,
+                'default': ju.java_default(java_type),
+                'hash_code': hash_code}
+
+
+def enum_type(ctx, name):
+    """
+    Emits the output of enum_type.jinja.
+
+    :param ctx: the wrapped typedef of an enumeration
+    :param name: the name of the enum
+    :return: the java source
+    """
+    out = ['%s\npackage %s;\n\n' % (ctx.top().get_copy_right(),
+                                    ctx.package())]
+    if ctx.type.has_javanames:
+        out.append('import com.fasterxml.jackson.annotation.JsonCreator;\n'
+                   'import com.fasterxml.jackson.annotation.JsonValue;\n\n')
+    out.append('%s\npublic enum %s {\n  ' % (
+        description(ctx), name))
+    out.append(', '.join(
+        '%s("%s")' % (value.javaname, key) if value.javaname else key
+        for key, value in ctx.type.enums.items()))
+    if ctx.type.has_javanames:
+        out.append(';\n\n'
+                   '  private final String jsonName;\n\n'
+                   '  private %(name)s(){\n'
+                   '      this.jsonName = this.name();\n'
+                   '  }\n\n'
+                   '  private %(name)s(String jsonName) {\n'
+                   '    this.jsonName = jsonName;\n'
+                   '  }\n\n'
+                   '  @JsonCreator\n'
+                   '  public static %(name)s fromJsonString('
+                   'String jsonString) {\n'
+                   '    for (%(name)s value : %(name)s.values())\n'
+                   '      if (value.jsonName.equals(jsonString)) {\n'
+                   '        return value;\n'
+                   '      }\n'
+                   '    return null;\n'
+                   '  }\n\n'
+                   '  @JsonValue\n'
+                   '  public String toJsonString() {\n'
+                   '    return this.jsonName;\n'
+                   '  }\n' % {'name': name})
+    out.append('\n}')
+    return ''.join(out)
+
+
+# emitters by the name of the template they replace
+EMITTERS = {
+    'grouping.jinja': grouping,
+    'class_type.jinja': class_type,
+    'enum_type.jinja': enum_type,
+}
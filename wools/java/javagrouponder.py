@@ -2,6 +2,8 @@ from wools.java.javanodewrapper import JavaNodeWrapper
 from . import javautils as ju
 from .wool import PARENT
 
+from alpakka.logger import LOGGER
+
 from collections import OrderedDict
 
 
@@ -9,6 +11,7 @@ class JavaGrouponder(JavaNodeWrapper):
 
     def __init__(self, *args):
         super(JavaGrouponder, self).__init__(*args)
+        self.order_children()
         # all veriables defined by the grouponder without uses
         self.vars = OrderedDict()
         for item in self.children.values():
@@ -139,6 +142,34 @@ class JavaList(JavaGrouponder, PARENT['list']):
                 self.java_type = 'List'
         # collect list of keys
         self.keys = [ju.to_camelcase(key) for key in self.keys]
+        if self.WOOL.key_classes and self.keys and \
+                self.top().exists_class(getattr(self, 'element_type', None)):
+            key_vars = self.key_vars()
+            if all(var.parse_expression('key') for var in key_vars.values()):
+                self.key_type = self.generate_java_type('Key')
+            else:
+                LOGGER.debug("No key class for %s, unparsable key types",
+                             self.element_type)
+
+    def key_vars(self):
+        """
+        Collects the key variables in the order of the key statement.
+
+        :return: dictionary of key variables
+        """
+        result = OrderedDict()
+        for key in self.statement.search_one('key').arg.split():
+            result[ju.to_camelcase(key)] = self.all_vars[ju.to_java_name(key)]
+        return result
+
+    def key_imports(self):
+        """
+        :return: imports needed by the key class of this list
+        """
+        imports = ju.ImportDict()
+        for var in self.key_vars().values():
+            imports.merge(var.java_imports)
+        return imports.get_imports()
 
 
 class JavaGrouping(JavaGrouponder, PARENT['grouping']):
@@ -1,13 +1,15 @@
 from alpakka.wrapper.nodewrapper import NodeWrapper
 from collections import OrderedDict
 
+from . import javacache
 from . import javautils as ju
 from .wool import PARENT
 
-from jinja2 import Environment, PackageLoader
+from jinja2 import ChoiceLoader, Environment, PackageLoader
 
 from alpakka.logger import LOGGER
 import os
+import pyang.types
 import re
 
 
@@ -19,6 +21,8 @@ class JavaBaseType:
     def __init__(self, data_type):
         self.java_imports = ju.ImportDict()
         self.java_type = data_type
+        if data_type in ju.JAVA_TYPE_IMPORTS:
+            self.java_imports.add_import(*ju.JAVA_TYPE_IMPORTS[data_type])
         # is a cast needed to use hashCode
         self.java_cast = ju.JAVA_WRAPPER_CLASSES.get(self.java_type, None)
         self.group = 'base'
@@ -60,6 +64,54 @@ class JavaNodeWrapper:
             result += getattr(self, 'keys', ())
         return result
 
+    def query_parameters(self, parents_only=False):
+        """
+        Collects the query parameters of the backend getter for this node if
+        the wool generates them. Lists are paged with offset and limit, all
+        other nodes with children support the selection of fields.
+
+        :param parents_only: flag that decides if the getter is the one for
+                             the whole list
+        :return: dictionary of parameter names and java types
+        """
+        if not self.WOOL.query_params or self.WOOL.bulk_fetch or \
+                not getattr(self, 'children', None):
+            # bulk fetched subtrees are projected in memory
+            return OrderedDict()
+        if parents_only and getattr(self, 'group', None) == 'list':
+            return OrderedDict([('offset', 'int'), ('limit', 'int')])
+        return OrderedDict([('fields', 'Set<String>')])
+
+    def order_children(self):
+        """
+        Orders the wrapped children and used groupings by their definition in
+        the yang model. They are wrapped in the iteration order of a set of
+        statements, which changes between runs.
+        """
+        order = {}
+        for stmt in getattr(self.statement, 'i_children', ()):
+            order.setdefault(stmt.arg, len(order))
+            augment = getattr(stmt, 'i_augment', None)
+            for uses in augment.search('uses') if augment else ():
+                order.setdefault(uses.arg, len(order))
+        for uses in self.statement.search('uses'):
+            order.setdefault(uses.i_grouping.arg, len(order))
+        for attr in ('children', 'uses'):
+            items = getattr(self, attr).items()
+            setattr(self, attr, OrderedDict(sorted(items, key=lambda item: (
+                order.get(item[0], len(order)), item[0]))))
+
+    def subtree_root(self):
+        """
+        Finds the root element of the subtree this node belongs to, which is
+        the ancestor that is a direct child of the module.
+
+        :return: the root element
+        """
+        if self.parent is None or self.parent.parent is None:
+            return self
+        return self.parent.subtree_root()
+
     def generate_java_type(self, appendix=""):
 
         if self.is_augmented:
@@ -98,18 +150,22 @@ class JavaModule(JavaNodeWrapper, PARENT['module']):
 
         self.output_path = self.WOOL.output_path
         # variables for output generation
-        path = '/templates'
-        item = self.WOOL
-        while item.name != 'default':
-            path = '/' + item.name[0].lower() + item.name[1:] + path
-            item = item.parent
-        self.env = Environment(loader=PackageLoader('wools', path))
+        self.env = Environment(loader=ChoiceLoader([
+            PackageLoader('wools', path)
+            for path in self.WOOL.template_paths()]))
         # add filters to environment
         self.env.filters['firstupper'] = ju.firstupper
         self.env.filters['firstlower'] = ju.firstlower
         self.env.filters['javadefault'] = ju.java_default
+        self.env.filters['javaboxed'] = ju.java_boxed
+        self.env.filters['javaname'] = ju.to_java_name
+        self.env.filters['jsonwrite'] = ju.java_json_write
+        self.env.filters['jsonread'] = ju.java_json_read
+        # digest of the templates and configuration for the render cache
+        self.render_digest = None
 
         super(JavaModule, self).__init__(statement, parent)
+        self.order_children()
 
     def enums(self):
         """
@@ -138,6 +194,15 @@ class JavaModule(JavaNodeWrapper, PARENT['module']):
         return {name: data for name, data in self.typedefs.items()
                 if data.type.group == 'type'}
 
+    def bits(self):
+        """
+        Extracts all bits from the typedefs, including the ones of leafs.
+
+        :return: dictionary of bits
+        """
+        return {name: data for name, data in self.typedefs.items()
+                if data.type.group == 'bits'}
+
     def unions(self):
         """
         Extracts all unions from the typedefs.
@@ -147,6 +212,102 @@ class JavaModule(JavaNodeWrapper, PARENT['module']):
         return {name: data for name, data in self.typedefs.items()
                 if data.type.group == 'union'}
 
+    def wrapped_nodes(self):
+        """
+        Collects all wrapped nodes of the module, including the classes and
+        the inputs and outputs of the rpcs.
+
+        :return: list of wrapped nodes
+        """
+        result = OrderedDict()
+        for nodes in self.all_nodes.values():
+            for node in nodes.values():
+                result[id(node)] = node
+        for node in self.classes.values():
+            result[id(node)] = node
+        for rpc in self.rpcs.values():
+            for node in (getattr(rpc, 'input', None),
+                         getattr(rpc, 'output', None)):
+                if node is not None:
+                    result[id(node)] = node
+        return list(result.values())
+
+    def list_keys(self):
+        """
+        Extracts the key classes of all keyed lists.
+
+        :return: dictionary of lists by key class name
+        """
+        return {data.key_type: data for data in self.classes.values()
+                if getattr(data, 'key_type', None)}
+
+    def indexed_lists(self, levels):
+        """
+        Collects the keyed lists with key classes that are part of the backend
+        interface, i.e. that are reachable within the given interface levels
+        and have no keyed parents.
+
+        :param levels: the number of interface levels
+        :return: list of tuples with the name and the wrapped list
+        """
+        result = []
+        if self.WOOL.bulk_fetch:
+            # subtrees are fetched at once, there are no list getters
+            return result
+        nodes = [(1, name, child)
+                 for name, child in self.get_root_elements().items()]
+        while nodes:
+            depth, name, node = nodes.pop(0)
+            if getattr(node, 'key_type', None) and \
+                    not node.collect_keys(only_parents=True):
+                result.append((name, node))
+            if depth < levels:
+                nodes.extend((depth + 1, ch_name, child) for ch_name, child
+                             in getattr(node, 'children', {}).items())
+        return result
+
+    def backend_getters(self, roots, levels):
+        """
+        Collects the getter and fetch methods of the backend interface of the
+        given root elements, i.e. the getter of every node within the given
+        interface levels, the one of the single list entries and the one of
+        the remaining path at the last level, or the fetch methods of the
+        subtrees in case of bulk fetches. The
+        backend interface, its implementation and the caching backend are
+        all generated from this list.
+
+        :param roots: dictionary of the root elements by name
+        :param levels: the number of interface levels
+        :return: list of tuples with the method prefix, the name, the wrapped
+                 node, the return type, the parents only flag and the path
+                 name of the parameters, see key_parameters of fub.jinja
+        """
+        result = []
+
+        def collect(nodes, depth):
+            for name, node in nodes.items():
+                children = getattr(node, 'children', None) or {}
+                keys = getattr(node, 'keys', None)
+                if self.WOOL.bulk_fetch and children:
+                    result.append(('fetch', name, node, node.java_type, True,
+                                   None))
+                    continue
+                if depth <= levels:
+                    result.append(('get', name, node, node.java_type, True,
+                                   None))
+                if depth <= levels and keys:
+                    result.append(('get', name, node, node.element_type,
+                                   False, None))
+                if depth == levels and children:
+                    result.append((
+                        'get', name, node,
+                        node.element_type if keys else node.java_type,
+                        False, 'remainingPath'))
+                collect(children, depth + 1)
+
+        collect(roots, 1)
+        return result
+
     def rpc_imports(self):
         return {imp for _, data in getattr(self, 'rpcs', {}).items()
                 for imp in getattr(data, 'imports', ())}
@@ -244,37 +405,92 @@ class JavaModule(JavaNodeWrapper, PARENT['module']):
                 subpath = context['path']
             # get the output path for the file
             output_path = "%s/%s/%s" % (self.output_path, 'src', subpath)
-            # create folder if not available
-            if not os.path.exists(output_path):
-                os.makedirs(output_path)
-            # render the template
-            output = template.render(ctx=context, name=key)
+            # render the template or look it up in the render cache
+            output = self.render(template, key, context)
             # print the output for debugging
             LOGGER.debug(output)
-            # write to file
-            with open("%s/%s.java" % (output_path, key), 'w', encoding="utf-8",
-                      newline="\n") as f:
-                f.write(output)
+            self.write_file(output_path, "%s.java" % key, output)
+
+    def render(self, template, name, context):
+        """
+        Renders the template for the given context. If the wool has a render
+        cache, the output for wrapped nodes is looked up in the cache first,
+        with a key computed from the sources of all templates, the wool
+        configuration and the serialized node.
+
+        :param template: the template to be rendered
+        :param name: the name of the generated class
+        :param context: the wrapped node or dictionary to be rendered
+        :return: the rendered output
+        """
+        cache = self.WOOL.render_cache
+        if cache is None or not hasattr(context, 'subpath'):
+            return self.emit(template, name, context)
+        if self.render_digest is None:
+            self.render_digest = javacache.render_key(
+                [self.env.loader.get_source(self.env, template_name)[0]
+                 for template_name in self.env.list_templates()],
+                self.WOOL.config_digest())
+        cache_key = javacache.render_key(
+            self.render_digest, template.name, name, context.package(),
+            context.subpath(), javacache.serialize_context(context))
+        output = cache.get(cache_key)
+        if output is None:
+            output = self.emit(template, name, context)
+            cache.put(cache_key, output)
+        return output
+
+    def emit(self, template, name, context):
+        """
+        Renders the template for the given context, with the emitter of the
+        wool that replaces the template if the fast emitter is enabled.
+
+        :param template: the template to be rendered
+        :param name: the name of the generated class
+        :param context: the wrapped node or dictionary to be rendered
+        :return: the rendered output
+        """
+        output = None
+        if self.WOOL.fast_emitter and template.name in self.WOOL.emitters:
+            output = self.WOOL.emitters[template.name](context, name)
+        if output is None:
+            output = template.render(ctx=context, name=name)
+        return output
 
     def generate_pom(self, template_name, description_dict):
 
         template = self.env.get_template(template_name)
         # get the output path for the file
         output_path = "%s" % self.output_path
-        # create folder if not available
-        if not os.path.exists(output_path):
-            os.makedirs(output_path)
         # render the template
         output = template.render(ctx=description_dict, name='')
         # print the output for debugging
         LOGGER.debug(output)
+        self.write_file(output_path, "%s.xml" % 'pom', output)
+
+    def write_file(self, output_path, file_name, output):
+        """
+        Writes the generated output to a file. In verify mode the output is
+        only collected by the wool, which compares it to the existing files
+        afterwards.
+
+        :param output_path: the directory of the file
+        :param file_name: the name of the file
+        :param output: the generated output
+        """
+        if self.WOOL.verify:
+            self.WOOL.rendered["%s/%s" % (output_path, file_name)] = output
+            return
+        # create folder if not available
+        if not os.path.exists(output_path):
+            os.makedirs(output_path)
         # write to file
-        with open("%s/%s.xml" % (output_path, 'pom'), 'w', encoding="utf-8",
+        with open("%s/%s" % (output_path, file_name), 'w', encoding="utf-8",
                   newline="\n") as f:
             f.write(output)
 
 
-class JavaBits(NodeWrapper, yang='bits'):
+class JavaBits(JavaNodeWrapper, NodeWrapper, yang='bits'):
     """
     Wrapper class for bits statement
     """
@@ -286,8 +502,26 @@ class JavaBits(NodeWrapper, yang='bits'):
         self.java_imports.add_import(self.package(), self.java_type)
         self.bits = OrderedDict()
         self.group = 'bits'
-        for stmt in statement.search('bit'):
+        for stmt in statement.search_one('type').search('bit'):
             self.bits[stmt.arg] = JavaBit(stmt, self)
+        if parent.yang_type() != 'typedef':
+            # bits of leafs are generated like the ones of typedefs
+            self.top().add_typedef(self.java_type, parent)
+
+    def sorted_bits(self):
+        """
+        :return: the bits ordered by their position
+        """
+        return sorted(self.bits.values(), key=lambda bit: bit.position)
+
+    def words(self):
+        """
+        The number of longs needed to store all bits.
+
+        :return: number of 64 bit words
+        """
+        return max((bit.position for bit in self.bits.values()),
+                   default=0) // 64 + 1
 
 
 class JavaBit(NodeWrapper):
@@ -297,9 +531,13 @@ class JavaBit(NodeWrapper):
 
     def __init__(self, statement, parent):
         super().__init__(statement, parent)
-        javaname = self.yang_name()
+        # add an underscore in case the name starts with a number
+        javaname = re.sub(r'^(\d)', r'_\1', self.yang_name().upper())
         javaname = javaname.replace('-', '_').replace('.', '_')
         self.javaname = javaname
+        # pyang assigns the positions of bits without explicit position
+        self.position = getattr(statement, 'i_position',
+                                len(parent.bits))
 
 
 class JavaEnum(JavaNodeWrapper, PARENT['enum']):
@@ -343,11 +581,172 @@ class JavaUnion(JavaNodeWrapper, PARENT['union']):
     """
 
     def __init__(self, statement, parent):
+        top = parent.top()
+        for stmt in statement.search('type'):
+            # wrap the typedefs of members like the ones of leafs, before the
+            # union looks them up, also replacing the ones wrapped by the
+            # plain union of the parent typonder
+            if not pyang.types.is_base_type(stmt.arg) and \
+                    not isinstance(top.derived_types.get(stmt.arg),
+                                   JavaNodeWrapper) and \
+                    getattr(stmt, 'i_typedef', None):
+                top.derived_types[stmt.arg] = self.WOOL['typedef'](
+                    stmt.i_typedef, parent=top)
         super().__init__(statement, parent)
         self.group = 'union'
         self.type = None
         # list of types that belong to the union
         self.java_imports = ju.ImportDict()
+        # inline enumeration members by the name of their nested enum
+        self.enumerations = OrderedDict()
+        for stmt in statement.search('type'):
+            if stmt.arg == 'enumeration':
+                name = 'Enumeration%s' % (len(self.enumerations) + 1
+                                          if self.enumerations else '')
+                self.enumerations[name] = self.WOOL['enumeration'](stmt, self)
+
+    def members(self):
+        """
+        Collects the member types of the union with the cases, in which the
+        generated deserializer creates them from a JSON token. A case is a
+        tuple of the token, a java condition on the string ``text`` or None,
+        and the java expression creating the member. Checks that need
+        precompiled patterns or lookup tables refer to the returned constants.
+
+        :return: tuple of the dictionary of the java type and the cases of the
+                 members by field name and the dictionary of the constant
+                 initializers by name
+        """
+        members = OrderedDict()
+        constants = OrderedDict()
+        for stmt in self.statement.search('type'):
+            if stmt.arg == 'enumeration':
+                # generated as nested enum of the union
+                java_type, inner = next(
+                    (name, enum) for name, enum in self.enumerations.items()
+                    if enum.statement is stmt)
+                cases = self.enum_cases(inner, java_type, constants)
+            elif pyang.types.is_base_type(stmt.arg):
+                member = self.WOOL.data_type_mappings[stmt.arg]
+                java_type = member
+                cases = self.base_cases(stmt, constants)
+            else:
+                member = self.top().derived_types.get(
+                    stmt.arg, self.types.get(stmt.arg))
+                java_type = getattr(member, 'java_type', None)
+                cases = self.typedef_cases(member, constants)
+            if not java_type or (java_type not in ju.JAVA_JSON_TOKENS and
+                                 pyang.types.is_base_type(java_type)):
+                # e.g. identityrefs, which have no java class
+                continue
+            field = ju.firstlower(ju.java_class_name(
+                java_type.replace('[]', 's'))) + 'Value'
+            members.setdefault(field, (java_type, []))[1].extend(cases)
+        return members, constants
+
+    @staticmethod
+    def dispatch(members):
+        """
+        Groups the deserializer cases of the members by JSON token, in the
+        order of the union. The cases of a token end with the first case
+        without condition.
+
+        :param members: the members, see members
+        :return: dictionary of tuples of the (condition, value) pairs and
+                 whether the last case has no condition by token
+        """
+        tokens = OrderedDict()
+        for _, cases in members.values():
+            for token, condition, value in cases:
+                checks, complete = tokens.get(token, ([], False))
+                if not complete:
+                    checks.append((condition, value))
+                    tokens[token] = (checks, condition is None)
+        return tokens
+
+    def base_cases(self, stmt, constants, wrap='%s'):
+        """
+        Creates the deserializer cases of a base type member.
+
+        :param stmt: the type statement of the member
+        :param constants: dictionary of the constants to add to
+        :param wrap: format string wrapping the created value
+        :return: list of cases
+        """
+        java_type = self.WOOL.data_type_mappings[stmt.arg]
+        tokens, value = ju.JAVA_JSON_TOKENS.get(java_type, ((), None))
+        condition = None
+        patterns = [pattern.arg for pattern in stmt.search('pattern')]
+        if patterns and java_type == 'String':
+            # a value must match all patterns of a type
+            condition = ' && '.join(
+                '%s.matcher(text).matches()' % self.add_constant(
+                    constants, 'Pattern.compile(%s)' % ju.java_string(pattern))
+                for pattern in patterns)
+        cases = [(token, condition, wrap % value) for token in tokens]
+        parse = ju.java_parse(java_type, 'text')
+        if stmt.arg in ju.YANG_STRING_NUMBERS and parse:
+            pattern = self.add_constant(constants, 'Pattern.compile(%s)' % (
+                ju.java_string(ju.YANG_STRING_NUMBERS[stmt.arg])))
+            cases.append(('VALUE_STRING', '%s.matcher(text).matches()' %
+                          pattern, wrap % parse))
+        return cases
+
+    def typedef_cases(self, typedef, constants):
+        """
+        Creates the deserializer cases of a typedef member.
+
+        :param typedef: the wrapped typedef
+        :param constants: dictionary of the constants to add to
+        :return: list of cases
+        """
+        inner = getattr(typedef, 'type', None)
+        group = getattr(inner, 'group', None)
+        if group == 'enum':
+            return self.enum_cases(inner, typedef.java_type, constants)
+        if group == 'bits':
+            name = '(%s)' % '|'.join(re.escape(bit) for bit in inner.bits)
+            pattern = self.add_constant(
+                constants, 'Pattern.compile(%s)' % ju.java_string(
+                    r'\s*(%s(\s+%s)*)?\s*' % (name, name)))
+            return [('VALUE_STRING', '%s.matcher(text).matches()' % pattern,
+                     '%s.fromJsonString(text)' % typedef.java_type)]
+        if group == 'base':
+            return self.base_cases(typedef.statement.search_one('type'),
+                                   constants, 'new %s(%%s)' % (
+                                       typedef.java_type))
+        return []
+
+    def enum_cases(self, enumeration, java_type, constants):
+        """
+        Creates the deserializer cases of an enumeration member.
+
+        :param enumeration: the wrapped enumeration
+        :param java_type: the java enum of the enumeration
+        :param constants: dictionary of the constants to add to
+        :return: list of cases
+        """
+        names = self.add_constant(
+            constants, 'new HashSet<>(Arrays.asList(%s))' % ', '.join(
+                ju.java_string(name) for name in enumeration.enums))
+        if enumeration.has_javanames():
+            value = '%s.fromJsonString(text)' % java_type
+        else:
+            value = '%s.valueOf(text)' % java_type
+        return [('VALUE_STRING', '%s.contains(text)' % names, value)]
+
+    @staticmethod
+    def add_constant(constants, initializer):
+        """
+        Adds a constant of the deserializer.
+
+        :param constants: dictionary of the constants
+        :param initializer: the java expression initializing the constant
+        :return: the name of the constant
+        """
+        name = 'CHECK_%d' % len(constants)
+        constants[name] = initializer
+        return name
 
 
 class JavaRPC(JavaNodeWrapper, PARENT['rpc']):
@@ -41,6 +41,38 @@ class JavaTyponder(JavaNodeWrapper):
         """
         return self.type.java_imports
 
+    def parse_expression(self, value):
+        """
+        Creates a java expression that parses the string expression `value`
+        into the java type of this node.
+
+        :param value: java expression of type String
+        :return: the java expression or None if the type can't be parsed
+        """
+        data_type = getattr(self, 'type', None)
+        if isinstance(data_type, JavaBaseType):
+            return ju.java_parse(data_type.java_type, value)
+        if getattr(data_type, 'group', None) == 'bits':
+            return '%s.fromJsonString(%s)' % (data_type.java_type, value)
+        if isinstance(data_type, JavaTypeDef) and \
+                data_type.data_type != 'leafref':
+            inner = data_type.type
+            if getattr(inner, 'group', None) == 'bits':
+                return '%s.fromJsonString(%s)' % (data_type.java_type, value)
+            if getattr(inner, 'group', None) == 'enum':
+                if inner.has_javanames():
+                    return '%s.fromJsonString(%s)' % (data_type.java_type,
+                                                      value)
+                return '%s.valueOf(%s)' % (data_type.java_type, value)
+            if isinstance(inner, JavaBaseType):
+                base = ju.java_parse(inner.java_type, value)
+                return base and 'new %s(%s)' % (data_type.java_type, base)
+            return None
+        if isinstance(data_type, JavaTyponder):
+            # leafrefs are parsed like the referenced leaf
+            return data_type.parse_expression(value)
+        return None
+
 
 class JavaLeaf(JavaTyponder, PARENT['leaf']):
 
@@ -1,5 +1,9 @@
+import hashlib
+import os
 import re
 
+import pyang.types
+
 JAVA_LIST_IMPORTS = ('java.util', 'List')
 
 JAVA_LIST_IMPORTS = ('java.util', 'List')
@@ -14,14 +18,65 @@ JAVA_RESERVED_WORDS = frozenset(["switch", "case"])
 
 JAVA_WRAPPER_CLASSES = {
     "int": "Integer",
+    "long": "Long",
     "boolean": "Boolean",
     "double": "Double"
 }
 
+# imports of java types that can be configured for yang base types
+JAVA_TYPE_IMPORTS = {
+    "BigInteger": ("java.math", "BigInteger"),
+    "BigDecimal": ("java.math", "BigDecimal"),
+}
+
 JAVA_FORBIDDEN_ROOTS = {'rpc'}
 
+# JSON tokens of java base types and the parser calls reading them
+JAVA_JSON_TOKENS = {
+    "int": (("VALUE_NUMBER_INT",), "parser.getIntValue()"),
+    "long": (("VALUE_NUMBER_INT",), "parser.getLongValue()"),
+    "BigInteger": (("VALUE_NUMBER_INT",), "parser.getBigIntegerValue()"),
+    "double": (("VALUE_NUMBER_INT", "VALUE_NUMBER_FLOAT"),
+               "parser.getDoubleValue()"),
+    "BigDecimal": (("VALUE_NUMBER_INT", "VALUE_NUMBER_FLOAT"),
+                   "parser.getDecimalValue()"),
+    "boolean": (("VALUE_TRUE", "VALUE_FALSE"), "parser.getBooleanValue()"),
+    "String": (("VALUE_STRING",), "text"),
+    "byte[]": (("VALUE_STRING",), "parser.getBinaryValue()"),
+}
+
+# JsonGenerator methods writing java base types
+JAVA_JSON_WRITERS = {
+    "int": "writeNumber",
+    "long": "writeNumber",
+    "BigInteger": "writeNumber",
+    "double": "writeNumber",
+    "BigDecimal": "writeNumber",
+    "boolean": "writeBoolean",
+    "String": "writeString",
+    "byte[]": "writeBinary",
+}
+
+# yang types that are encoded as JSON strings, with their patterns
+YANG_STRING_NUMBERS = {
+    "int64": r"-?[0-9]+",
+    "uint64": r"[0-9]+",
+    "decimal64": r"-?[0-9]+(\.[0-9]+)?",
+}
+
+# methods to parse strings into java base types
+JAVA_PARSE_METHODS = {
+    "int": "Integer.parseInt",
+    "long": "Long.parseLong",
+    "boolean": "Boolean.parseBoolean",
+    "double": "Double.parseDouble",
+    "BigInteger": "new BigInteger",
+    "BigDecimal": "new BigDecimal"
+}
+
 default_values = {
     'int': 0,
+    'long': '0L',
     'boolean': 'false',
     'double': '0.0',
     'String': '""'
@@ -148,6 +203,226 @@ def java_default(value):
     return default_values.get(value, 'null')
 
 
+def java_boxed(value):
+    """
+    Maps a primitive java type to its wrapper class, which is needed for
+    generic type arguments. Other types are returned unchanged.
+
+    :param value: the java type string
+    :return: the boxed java type
+
+    >>> java_boxed('boolean')
+    'Boolean'
+    >>> java_boxed('List<String>')
+    'List<String>'
+    """
+    return JAVA_WRAPPER_CLASSES.get(value, value)
+
+
+def java_parse(java_type, value):
+    """
+    Creates a java expression that parses the string expression `value` into
+    the given java base type.
+
+    :param java_type: the java base type string
+    :param value: java expression of type String
+    :return: the java expression or None if the type can't be parsed
+
+    >>> java_parse('int', 'key')
+    'Integer.parseInt(key)'
+    >>> java_parse('String', 'key')
+    'key'
+    >>> java_parse('Object', 'key') is None
+    True
+    """
+    if java_type == 'String':
+        return value
+    method = JAVA_PARSE_METHODS.get(java_type)
+    return method and '%s(%s)' % (method, value)
+
+
+def java_json_write(java_type, value):
+    """
+    Creates a java statement writing the expression `value` of the given
+    java base type with the JsonGenerator ``generator``.
+
+    :param java_type: the java base type string
+    :param value: java expression of the given type
+    :return: the java statement or None if the type has no direct writer
+
+    >>> java_json_write('int', 'port')
+    'generator.writeNumber(port);'
+    >>> java_json_write('Percent', 'level') is None
+    True
+    """
+    method = JAVA_JSON_WRITERS.get(java_type)
+    return method and 'generator.%s(%s);' % (method, value)
+
+
+def java_json_read(java_type):
+    """
+    Creates a java expression reading a value of the given java base type
+    from the current token of the JsonParser ``parser``. Numbers are also
+    read from strings, which RESTCONF uses for 64 bit and decimal values.
+
+    :param java_type: the java base type string
+    :return: the java expression or None if the type has no direct reader
+
+    >>> java_json_read('String')
+    'parser.getText()'
+    >>> print(java_json_read('long'))  # doctest: +NORMALIZE_WHITESPACE
+    (parser.getCurrentToken() == JsonToken.VALUE_STRING
+     ? Long.parseLong(parser.getText().trim()) : parser.getLongValue())
+    >>> java_json_read('List<String>') is None
+    True
+    """
+    if java_type == 'String':
+        return 'parser.getText()'
+    tokens, value = JAVA_JSON_TOKENS.get(java_type, ((), None))
+    if 'VALUE_NUMBER_INT' in tokens:
+        value = ('(parser.getCurrentToken() == JsonToken.VALUE_STRING'
+                 ' ? %s : %s)' % (
+                     java_parse(java_type, 'parser.getText().trim()'), value))
+    return value
+
+
+def java_string(value):
+    """
+    Creates a java string literal.
+
+    >>> print(java_string('say "hi"'))
+    "say \\"hi\\""
+
+    :param value: the content of the string
+    :return: the java string literal
+    """
+    return '"%s"' % value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def compare_file(path, output):
+    """
+    Compares generated output to an existing file, first by size and then by
+    hash.
+
+    >>> import tempfile
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     path = os.path.join(directory, 'A.java')
+    ...     with open(path, 'w') as f:
+    ...         _ = f.write('class A {}')
+    ...     print(compare_file(path, 'class A {}'),
+    ...           compare_file(path, 'class B {}'),
+    ...           compare_file(path + '.missing', 'class A {}'))
+    None differs missing
+
+    :param path: path of the existing file
+    :param output: the generated output
+    :return: None if equal, 'differs' or 'missing' otherwise
+    """
+    data = output.encode('utf-8')
+    try:
+        if os.path.getsize(path) != len(data):
+            return 'differs'
+        with open(path, 'rb') as f:
+            existing = hashlib.sha256(f.read()).digest()
+    except OSError:
+        return 'missing'
+    if existing != hashlib.sha256(data).digest():
+        return 'differs'
+    return None
+
+
+class TypeResolver:
+    """
+    Resolves yang base types to java types.
+
+    The ``(pattern, java type)`` pairs are compiled into a single regular
+    expression, whose alternatives are tried in the given order, and every
+    resolved yang type name is memoized. Like the ``alpakka`` type mappings,
+    patterns match from the beginning of the yang type name and unmatched yang
+    base types are returned unchanged.
+
+    >>> types = TypeResolver([(r"u?int\\d*", "int"), (r"string", "String")])
+    >>> types['uint8']
+    'int'
+    >>> types['string']
+    'String'
+    >>> types['boolean']
+    'boolean'
+    >>> types['foo'] is None
+    True
+
+    Added patterns take precedence over the initial ones, in the order they
+    are added:
+
+    >>> types.add_pattern(r"uint64", "BigInteger")
+    >>> types.add_pattern(r"uint\\d+", "long")
+    >>> types['uint64']
+    'BigInteger'
+    >>> types['uint32']
+    'long'
+    >>> types['int32']
+    'int'
+
+    Patterns may contain their own groups:
+
+    >>> types = TypeResolver([(r"(?P<size>u?int(8|16))", "short"),
+    ...                       (r"(u?)int\\d*", "int")])
+    >>> types['uint16']
+    'short'
+    >>> types['int32']
+    'int'
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        # number of added patterns, which precede the initial ones
+        self.added = 0
+        self.compile()
+
+    def compile(self):
+        """
+        Compiles the patterns into one regular expression and resets the
+        memo table. Every pattern is enclosed in a group, the groups of the
+        patterns themselves are numbered after it.
+        """
+        # index of the pattern by the number of its enclosing group
+        self.groups = {}
+        group = 1
+        for index, (pattern, _) in enumerate(self.patterns):
+            self.groups[group] = index
+            group += 1 + re.compile(pattern).groups
+        self.regex = re.compile('|'.join(
+            '(%s)' % pattern for pattern, _ in self.patterns))
+        self.memo = {}
+
+    def add_pattern(self, pattern, java_type):
+        """
+        Adds a pattern that takes precedence over the initial ones, but not
+        over the previously added ones.
+
+        :param pattern: regular expression matching yang type names
+        :param java_type: the java type of the matched yang types
+        """
+        self.patterns.insert(self.added, (pattern, java_type))
+        self.added += 1
+        self.compile()
+
+    def __getitem__(self, yang_type):
+        try:
+            return self.memo[yang_type]
+        except KeyError:
+            pass
+        data_type = None
+        match = self.patterns and self.regex.match(yang_type)
+        if match:
+            # the enclosing group of the matched pattern is closed last
+            data_type = self.patterns[self.groups[match.lastindex]][1]
+        elif pyang.types.is_base_type(yang_type):
+            data_type = yang_type
+        self.memo[yang_type] = data_type
+        return data_type
+
+
 class ImportDict:
     """
     Class that is used to store imports.
@@ -1,7 +1,42 @@
 from wools.java.java_wool import JavaWool
+from wools.java import javaemitter
 
 
 class JerseyWool(JavaWool):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # the JAX-RS backend interface returns completion stages
+        self.async_backend = True
+        self.rpc_type = 'CompletionStage<?>'
+        # the beans have their own template, the shared ones can be emitted
+        self.emitters = {
+            name: emitter for name, emitter in javaemitter.EMITTERS.items()
+            if name != 'grouping.jinja'}
+
+    def parse_config(self, path):
+        """
+        Loads the configuration like the java wool, the backend interface of
+        the jersey wool is always asynchronous. The JAX-RS resources only
+        serve the getters of the backend, so the options that add other
+        backend methods are rejected.
+
+        :param path: location of the config file
+        :return:
+        """
+        super().parse_config(path)
+        self.async_backend = True
+        for option, enabled in [('bulk-fetch', self.bulk_fetch),
+                                ('entity-tags', self.entity_tags)]:
+            if enabled:
+                raise ValueError("%s is not supported by the jersey wool"
+                                 % option)
+
+    def template_paths(self):
+        """
+        The jersey wool only provides the JAX-RS specific templates, all other
+        templates including the backend ones are shared with the akka wool.
+
+        :return: list of template directories
+        """
+        return super().template_paths() + ['/java/akka/templates']